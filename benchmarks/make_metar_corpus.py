@@ -0,0 +1,285 @@
+"""Synthetic METAR corpus for benchmarks/metar_suite.py.
+
+Covers the groups parse time depends on: US METAR/SPECI with remarks, WMO
+reports with trends, runway visual range, runway state, recent weather,
+several cloud layers and a share of malformed reports. Values are random
+and not meant to be meteorologically consistent. The suite falls back to
+this corpus when no recorded cycle file is present. To look at it:
+
+    python benchmarks/make_metar_corpus.py [--number 5000] [--seed 2023]
+"""
+import argparse
+import random
+import sys
+
+DEFAULT_NUMBER = 5000
+DEFAULT_SEED = 2023
+
+US_STATIONS = (
+    "KSLC KOGD KPVU KHIF KTVY KSGU KCDC KLGU KVEL KENV KDEN KCOS KGJT KASE "
+    "KPHX KTUS KLAS KRNO KBOI KSEA KPDX KSFO KLAX KSAN KORD KMSP KDFW KIAH "
+    "KATL KMIA KJFK KBOS KDCA KRPJ KDLH KBIS PANC PHNL"
+).split()
+WMO_STATIONS = (
+    "EGLL EGKK EGPH EIDW LFPG LFPO EDDF EDDM EHAM EBBR LSZH LOWW LEMD LIRF "
+    "ENGM ESSA EFHK UUEE RJTT RKSI ZBAA VHHH WSSS YSSY NZAA FAOR SBGR CYYZ"
+).split()
+
+WEATHER = (
+    "-RA RA +RA -DZ -SHRA SHRA VCSH TS -TSRA +TSRA VCTS HZ FU DU "
+    "-SN SN +SN -SHSN BLSN -FZRA -FZDZ -RASN -PL UP BR FG FZFG MIFG BCFG"
+).split()
+CLOUD_TYPES = ("", "", "", "CB", "TCU")
+US_LOW_VISIBILITY = "7SM 5SM 3SM 2SM 1SM 3/4SM 1/2SM 1/4SM M1/4SM".split() + ["1 1/2SM"]
+WMO_LOW_VISIBILITY = "8000 6000 4500 3000 1500 0800 0200".split()
+
+
+def _wind(rng, units="KT"):
+    roll = rng.random()
+    if roll < 0.08:
+        return "00000" + units
+    speed = rng.choice((3, 4, 5, 6, 7, 8, 9, 10, 12, 14, 16, 18, 22, 27, 33))
+    if units == "MPS":
+        speed = max(1, speed // 2)
+    if roll < 0.15 and speed < 7:
+        direction = "VRB"
+    else:
+        direction = "%03d" % rng.randrange(10, 361, 10)
+    group = "%s%02d" % (direction, speed)
+    if speed >= 10 and rng.random() < 0.4:
+        group += "G%02d" % (speed + rng.randrange(6, 16))
+    group += units
+    if direction != "VRB" and speed >= 6 and rng.random() < 0.1:
+        start = int(direction)
+        group += " %03dV%03d" % ((start - 40) % 360 or 360, (start + 40) % 360 or 360)
+    return group
+
+
+def _us_visibility(rng, low=False):
+    return rng.choice(US_LOW_VISIBILITY if low else ["10SM"] * 12 + US_LOW_VISIBILITY)
+
+
+def _wmo_visibility(rng, low=False):
+    return rng.choice(WMO_LOW_VISIBILITY if low else ["9999"] * 8 + WMO_LOW_VISIBILITY)
+
+
+def _weather(rng):
+    return rng.sample(WEATHER, rng.randrange(1, 3))
+
+
+def _sky(rng, clear):
+    if clear and rng.random() < 0.25:
+        return [rng.choice(clear)]
+    if rng.random() < 0.03:
+        return ["VV%03d" % rng.randrange(1, 8)]
+    layers = []
+    height = rng.randrange(3, 60)
+    for cover in rng.choices(("FEW", "SCT", "BKN", "OVC"), k=rng.randrange(1, 4)):
+        layers.append("%s%03d%s" % (cover, height, rng.choice(CLOUD_TYPES)))
+        height += rng.randrange(5, 80)
+    return layers
+
+
+def _temperatures(rng):
+    temp = rng.randrange(-25, 40)
+    dewpt = temp - rng.randrange(0, 20)
+
+    def fmt(value):
+        return ("M%02d" if value < 0 else "%02d") % abs(value)
+
+    return temp, dewpt, "%s/%s" % (fmt(temp), fmt(dewpt))
+
+
+def _tenths(value):
+    # Sign digit and three digits of tenths, as in the T, 1 and 2 groups
+    return "%d%03d" % (value < 0, abs(round(value * 10)))
+
+
+def _us_remarks(rng, auto, temp, dewpt, heavy):
+    remarks = ["AO2" if auto or rng.random() < 0.8 else "AO1"]
+    hour = rng.randrange(24)
+    if heavy:
+        if rng.random() < 0.6:
+            direction, speed = rng.randrange(10, 361, 10), rng.randrange(28, 60)
+            remarks.append(
+                "PK WND %03d%02d/%02d%02d" % (direction, speed, hour, rng.randrange(60))
+            )
+        if rng.random() < 0.3:
+            remarks.append("WSHFT %02d%02d" % (hour, rng.randrange(60)))
+            if rng.random() < 0.5:
+                remarks[-1] += " FROPA"
+        if rng.random() < 0.2:
+            remarks.append(
+                rng.choice(("LTG DSNT NE", "OCNL LTGICCG OHD", "LTG DSNT SE-SW"))
+            )
+        if rng.random() < 0.2:
+            remarks.append("TSB%02dE%02d" % (rng.randrange(60), rng.randrange(60)))
+        if rng.random() < 0.2:
+            remarks.append("RAB%02d" % rng.randrange(60))
+    remarks.append("SLP%03d" % rng.randrange(1000))
+    if rng.random() < 0.3:
+        remarks.append("P%04d" % rng.randrange(0, 60))
+    if heavy:
+        if rng.random() < 0.3:
+            remarks.append("6%04d" % rng.randrange(0, 120))
+        if rng.random() < 0.3:
+            remarks.append("7%04d" % rng.randrange(0, 200))
+        if rng.random() < 0.2:
+            remarks.append("4/%03d" % rng.randrange(1, 30))
+        if rng.random() < 0.1:
+            remarks.append("I1%03d" % rng.randrange(1, 20))
+    remarks.append("T%s%s" % (_tenths(temp + rng.random() - 0.5), _tenths(dewpt)))
+    if heavy:
+        if rng.random() < 0.6:
+            remarks.append("1%s" % _tenths(temp + rng.randrange(0, 5)))
+            remarks.append("2%s" % _tenths(temp - rng.randrange(0, 8)))
+        if rng.random() < 0.2:
+            remarks.append("4%s%s" % (_tenths(temp + 8), _tenths(temp - 10)))
+        if rng.random() < 0.6:
+            remarks.append("5%d%03d" % (rng.randrange(9), rng.randrange(40)))
+        if auto and rng.random() < 0.3:
+            remarks.append(rng.choice(("PNO", "FZRANO", "TSNO", "RVRNO", "$")))
+    return remarks
+
+
+def us_report(rng, day, remarks_heavy):
+    auto = rng.random() < 0.6
+    kind = "SPECI" if rng.random() < 0.12 else "METAR"
+    if kind == "SPECI":
+        minute = rng.randrange(60)
+    else:
+        minute = rng.choice((51, 52, 53, 54, 55, 56))
+    station = rng.choice(US_STATIONS)
+    temp, dewpt, temp_group = _temperatures(rng)
+    groups = [
+        kind,
+        station,
+        "%02d%02d%02dZ" % (day, rng.randrange(24), minute),
+    ]
+    if auto:
+        groups.append("AUTO")
+    groups.append(_wind(rng))
+    low_visibility = rng.random() < 0.2
+    groups.append(_us_visibility(rng, low_visibility))
+    if low_visibility and rng.random() < 0.3:
+        low, high = rng.randrange(6, 30) * 100, rng.randrange(30, 60) * 100
+        groups.append("R%02dL/%04dV%04dFT" % (rng.randrange(1, 36), low, high))
+    if rng.random() < 0.35:
+        groups.extend(_weather(rng))
+    groups.extend(_sky(rng, ("CLR", "SKC")))
+    groups.append(temp_group)
+    groups.append("A%04d" % rng.randrange(2900, 3090))
+    groups.append("RMK")
+    groups.extend(_us_remarks(rng, auto, temp, dewpt, remarks_heavy))
+    return " ".join(groups)
+
+
+def _trend(rng):
+    roll = rng.random()
+    if roll < 0.5:
+        return ["NOSIG"]
+    if roll < 0.75:
+        return ["TEMPO", _wmo_visibility(rng), _weather(rng)[0]]
+    return [
+        "BECMG",
+        "FM%02d%02d" % (rng.randrange(24), rng.choice((0, 30))),
+        _wind(rng),
+        rng.choice(("CAVOK", _wmo_visibility(rng))),
+    ]
+
+
+def wmo_report(rng, day):
+    units = "MPS" if rng.random() < 0.15 else "KT"
+    station = rng.choice(WMO_STATIONS)
+    _, _, temp_group = _temperatures(rng)
+    groups = ["METAR"] if rng.random() < 0.7 else []
+    minute = rng.choice((0, 20, 30, 50))
+    groups += [
+        station,
+        "%02d%02d%02dZ" % (day, rng.randrange(24), minute),
+    ]
+    groups.append(_wind(rng, units))
+    if rng.random() < 0.25:
+        groups.append("CAVOK")
+    else:
+        groups.append(_wmo_visibility(rng))
+        if rng.random() < 0.05:
+            groups.append("R%02dR/P1500" % rng.randrange(1, 36))
+        if rng.random() < 0.3:
+            groups.extend(_weather(rng)[:1])
+        groups.extend(_sky(rng, ("NSC", "NCD")))
+    groups.append(temp_group)
+    groups.append("Q%04d" % rng.randrange(970, 1045))
+    if rng.random() < 0.08:
+        groups.append("RE" + rng.choice(("RA", "SHRA", "TS", "SN", "SHSN")))
+    if rng.random() < 0.04:
+        groups.append("WS R%02d" % rng.randrange(1, 36))
+    if rng.random() < 0.1:
+        # Runway state: deposit, extent, depth, friction
+        state = "%d%d%02d%02d" % (
+            rng.randrange(10),
+            rng.choice((1, 2, 5, 9)),
+            rng.randrange(20),
+            rng.randrange(20, 96),
+        )
+        groups.append("R%02d/%s" % (rng.randrange(1, 36), state))
+    groups.extend(_trend(rng))
+    return " ".join(groups)
+
+
+def malformed_report(rng, report):
+    groups = report.split()
+    roll = rng.random()
+    if roll < 0.2:
+        # Truncated in transmission
+        return " ".join(groups[: rng.randrange(2, len(groups))])
+    if roll < 0.35:
+        junk = rng.choice(("XXXXX", "/////", "9999Z", "Q", "0000KT", "M"))
+        groups.insert(rng.randrange(2, len(groups)), junk)
+    elif roll < 0.5:
+        i = rng.randrange(2, len(groups) - 1)
+        groups[i], groups[i + 1] = groups[i + 1], groups[i]
+    elif roll < 0.65:
+        i = rng.randrange(1, len(groups))
+        group = groups[i]
+        cut = rng.randrange(len(group))
+        groups[i] = group[:cut] + rng.choice("/O1Z ") + group[cut + 1 :]
+    elif roll < 0.75:
+        return " ".join(groups[:3] + ["NIL"]) + "="
+    elif roll < 0.85:
+        return report + "="
+    elif roll < 0.95:
+        groups = [g.lower() if rng.random() < 0.3 else g for g in groups]
+    else:
+        return " ".join(groups) + " " + " ".join(groups[1:4])
+    return " ".join(groups)
+
+
+def generate(number=DEFAULT_NUMBER, seed=DEFAULT_SEED):
+    rng = random.Random(seed)
+    reports = []
+    for _ in range(number):
+        day = rng.randrange(1, 29)
+        roll = rng.random()
+        if roll < 0.45:
+            report = us_report(rng, day, remarks_heavy=False)
+        elif roll < 0.6:
+            report = us_report(rng, day, remarks_heavy=True)
+        else:
+            report = wmo_report(rng, day)
+        if rng.random() < 0.05:
+            report = malformed_report(rng, report)
+        reports.append(report)
+    return reports
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--number", type=int, default=DEFAULT_NUMBER)
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    args = parser.parse_args(argv)
+    sys.stdout.write("\n".join(generate(args.number, args.seed)) + "\n")
+
+
+if __name__ == "__main__":
+    main()
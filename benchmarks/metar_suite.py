@@ -0,0 +1,248 @@
+"""Benchmark suite for utils.metar over a corpus of reports.
+
+Reports parse throughput, time spent in each group handler and memory
+allocated per report, in strict and non-strict mode, after checking that
+lazy parses decode the same as eager ones. Run from the repository root:
+
+    python benchmarks/metar_suite.py [--corpus PATH] [--repeat 3] [--lazy]
+
+The corpus is a recorded NOAA cycle file, benchmarks/data/metar_cycle.txt,
+which can be refreshed with
+
+    curl -o benchmarks/data/metar_cycle.txt \
+        https://tgftp.nws.noaa.gov/data/observations/metar/cycles/12Z.TXT
+
+--corpus reads any other cycle file or file of one report per line. Without
+a recorded file the suite falls back to the synthetic corpus of
+make_metar_corpus.py.
+"""
+import argparse
+import functools
+import gc
+import os
+import re
+import sys
+import time
+import tracemalloc
+import warnings
+from collections import defaultdict
+from contextlib import contextmanager
+
+sys.path.insert(0, os.path.dirname(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src", "skydivewx"))
+
+import make_metar_corpus  # noqa: E402
+from utils.metar import Metar  # noqa: E402
+
+DEFAULT_CORPUS = os.path.join(os.path.dirname(__file__), "data", "metar_cycle.txt")
+# Timestamp lines of NOAA cycle files, e.g. "2023/10/17 12:53"
+CYCLE_TIMESTAMP_RE = re.compile(r"^\d{4}/\d\d/\d\d \d\d:\d\d$")
+
+
+def load_corpus(path):
+    reports = []
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith("#") and not CYCLE_TIMESTAMP_RE.match(line):
+                reports.append(line)
+    return reports
+
+
+def _parse_all(reports, strict, lazy):
+    failed = 0
+    for code in reports:
+        try:
+            Metar.Metar(code, strict=strict, lazy=lazy)
+        except Exception:
+            failed += 1
+    return failed
+
+
+def throughput(reports, strict, lazy=False, repeat=3):
+    """Best of `repeat` passes over the corpus, as (parses/s, failed)"""
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        failed = _parse_all(reports, strict, lazy)
+        best = min(best, time.perf_counter() - started)
+    return len(reports) / best, failed
+
+
+@contextmanager
+def _timed_handlers(totals):
+    # Swaps every handler table of Metar for wrappers that add the time
+    # spent in each handler to totals[name] = [calls, seconds]
+    def timed(handler):
+        @functools.wraps(handler)
+        def wrapper(self, d):
+            started = time.perf_counter()
+            try:
+                return handler(self, d)
+            finally:
+                entry = totals[handler.__name__]
+                entry[0] += 1
+                entry[1] += time.perf_counter() - started
+
+        return wrapper
+
+    tables = ("handlers", "trend_handlers", "remark_handlers")
+    saved = {name: getattr(Metar.Metar, name) for name in tables}
+    unparsed = Metar._unparsedGroup
+    try:
+        for name, table in saved.items():
+            setattr(
+                Metar.Metar,
+                name,
+                [(entry[0], timed(entry[1])) + tuple(entry[2:]) for entry in table],
+            )
+        Metar._unparsedGroup = timed(unparsed)
+        yield
+    finally:
+        for name, table in saved.items():
+            setattr(Metar.Metar, name, table)
+        Metar._unparsedGroup = unparsed
+
+
+def handler_times(reports, strict, lazy=False):
+    """Seconds per handler over one pass, plus the total for the pass. The
+    difference is regex matching and the parse loop itself"""
+    totals = defaultdict(lambda: [0, 0.0])
+    with _timed_handlers(totals):
+        started = time.perf_counter()
+        _parse_all(reports, strict, lazy)
+        elapsed = time.perf_counter() - started
+    return dict(totals), elapsed
+
+
+def allocations(reports, strict, lazy=False):
+    """Bytes per report as (allocated while parsing at peak, still held by
+    the parsed objects). The reports themselves are allocated up front so
+    only what parsing allocates and keeps alive is counted"""
+    parsed = []
+    peak = 0
+    gc.collect()
+    tracemalloc.start()
+    try:
+        start, _ = tracemalloc.get_traced_memory()
+        for code in reports:
+            before, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            try:
+                parsed.append(Metar.Metar(code, strict=strict, lazy=lazy))
+            except Exception:
+                pass
+            _, high = tracemalloc.get_traced_memory()
+            peak += high - before
+        gc.collect()
+        held, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak / len(reports), (held - start) / len(reports)
+
+
+def _decoded(metar):
+    # Every decoded attribute, with values compared by their text. Objects
+    # of the value types do not define equality
+    def plain(value):
+        if isinstance(value, (list, tuple)):
+            return type(value)(plain(item) for item in value)
+        if value is None or isinstance(value, (str, int, float)):
+            return value
+        return type(value).__name__, str(value)
+
+    decoded = {}
+    for name in Metar.Metar.__slots__:
+        if name not in ("_now", "_utcdelta"):
+            decoded[name] = plain(getattr(metar, name, None))
+    return decoded
+
+
+def lazy_mismatches(reports, strict=False):
+    """Reports whose lazy parse, once fully decoded, differs from the eager
+    parse. Lazy parses only raise for the main body, so reports the eager
+    parse rejects are skipped"""
+    mismatched = []
+    for code in reports:
+        try:
+            eager = Metar.Metar(code, strict=strict)
+        except Exception:
+            continue
+        lazy = Metar.Metar(code, strict=strict, lazy=True)
+        if _decoded(eager) != _decoded(lazy) or eager.string() != lazy.string():
+            mismatched.append(code)
+    return mismatched
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--corpus", default=DEFAULT_CORPUS, help="report file")
+    parser.add_argument(
+        "--number",
+        type=int,
+        default=make_metar_corpus.DEFAULT_NUMBER,
+        help="reports in the synthetic fallback corpus",
+    )
+    parser.add_argument("--seed", type=int, default=make_metar_corpus.DEFAULT_SEED)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument(
+        "--lazy", action="store_true", help="leave trend and remarks undecoded"
+    )
+    parser.add_argument(
+        "--handlers", type=int, default=15, help="slowest handlers listed per mode"
+    )
+    args = parser.parse_args(argv)
+
+    if os.path.exists(args.corpus):
+        reports = load_corpus(args.corpus)
+        print(f"{len(reports)} reports from {args.corpus}")
+    elif args.corpus == DEFAULT_CORPUS:
+        reports = make_metar_corpus.generate(args.number, args.seed)
+        print(
+            f"No recorded corpus at {args.corpus}, "
+            f"{len(reports)} synthetic reports, seed {args.seed}"
+        )
+    else:
+        parser.error(f"no corpus at {args.corpus}")
+    # Non-strict mode warns about every malformed report
+    warnings.simplefilter("ignore", RuntimeWarning)
+    # Warm up regex and lookup caches outside the measurements
+    _parse_all(reports[:200], False, args.lazy)
+
+    for strict in (True, False):
+        mismatched = lazy_mismatches(reports, strict)
+        mode = "strict" if strict else "non-strict"
+        print(f"{len(mismatched)} reports decode differently when lazy ({mode})")
+        for code in mismatched[:5]:
+            print(f"  {code}")
+
+    for strict in (True, False):
+        mode = "strict" if strict else "non-strict"
+        rate, failed = throughput(reports, strict, args.lazy, args.repeat)
+        peak, held = allocations(reports, strict, args.lazy)
+        print(f"\n{mode}{' lazy' if args.lazy else ''}")
+        print(f"  {rate:10,.0f} parses/s, {failed} reports failed")
+        print(f"  {peak:10,.0f} bytes/report allocated at peak while parsing")
+        print(f"  {held:10,.0f} bytes/report held by the parsed objects")
+
+        totals, elapsed = handler_times(reports, strict, args.lazy)
+        in_handlers = sum(seconds for _, seconds in totals.values())
+        print(
+            f"  {'handler':<28}{'calls':>8}{'us/call':>10}{'us/report':>11}"
+            f"{'share':>8}"
+        )
+        ranked = sorted(totals.items(), key=lambda item: item[1][1], reverse=True)
+        for name, (calls, seconds) in ranked[: args.handlers]:
+            print(
+                f"  {name:<28}{calls:>8}{seconds / calls * 1e6:>10.2f}"
+                f"{seconds / len(reports) * 1e6:>11.2f}{seconds / elapsed:>8.1%}"
+            )
+        other = elapsed - in_handlers
+        print(
+            f"  {'(matching and parse loop)':<28}{'':>8}{'':>10}"
+            f"{other / len(reports) * 1e6:>11.2f}{other / elapsed:>8.1%}"
+        )
+
+
+if __name__ == "__main__":
+    main()
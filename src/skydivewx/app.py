@@ -30,7 +30,8 @@ from pages import (
     errorPage,
     manifestPage,
 )
-from components.manifest.manifestComponents import screenshotImage
+from components.manifest import manifestComponents
+from utils import metarPoller, scheduler
 from utils.dropzones import dropzones
 from utils.dropzones.dropzoneUtils import DropzoneType
 
@@ -131,6 +132,12 @@ app.index_string = (
 
 server = app.server
 
+# Refresh upstream data (METAR, forecast, winds aloft, manifest) in the
+# background so callbacks only read the latest snapshots
+metarPoller.register()
+scheduler.start(server)
+manifestComponents.register_routes(server)
+
 
 def _with_header_footer(content: html.Div, dropZone: DropzoneType) -> list[html.Div]:
     return [
@@ -313,19 +320,26 @@ def help_modal(nc1, opened):
 
 @app.callback(
     Output("live-manifest-image-container", "children"),
+    Output("live-manifest-version", "data"),
     Input("refresh-interval", "n_intervals"),
     State("url", "search"),
+    State("live-manifest-version", "data"),
     prevent_initial_call=False,
 )
-def updateManifest(_, search):
+def updateManifest(_, search, clientVersion):
     dropZone = _get_dropzone_from_search(search)
-    image = screenshotImage(dropZone)
+    board = manifestComponents.manifestBoard(dropZone)
+    version = manifestComponents.manifestVersion(board)
+    if version is not None and version == clientVersion:
+        # The board has not changed since this client last received it
+        return no_update, no_update
+    image = manifestComponents.manifestView(dropZone, board)
     return [
         html.Div(
             id="live-manifest-fullscreen-modal",
             children=[html.Button(image, style={"border": "none"})],
         )
-    ]
+    ], version
 
 
 @app.callback(
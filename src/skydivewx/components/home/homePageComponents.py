@@ -1,4 +1,7 @@
-import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
+from typing import NamedTuple
+
+import numpy as np
 from dash import dcc, html
 from components.calendar import calenderComponents
 from components.home.weatherRadarComponents import radarComponent
@@ -9,10 +12,22 @@ from utils.dropzones.dropzoneUtils import DropzoneType
 from utils import timeUtils, weatherUtils
 import dash_mantine_components as dmc
 from utils.metar import Metar
+from utils.metarHistory import MetarColumns
 import dash_bootstrap_components as dbc
 import dash_daq as daq
 from dash_iconify import DashIconify
 
+FORECAST_NUM_HOURS = 6
+
+# Shared by every home page render, each render submits a handful of fetches
+_executor = ThreadPoolExecutor(max_workers=16, thread_name_prefix="home-page")
+
+
+class HomePageData(NamedTuple):
+    metar: Metar.Metar | None
+    metarHistory: MetarColumns | None
+    forecastData: list | None
+
 
 def renderCurrentWeather(
     dropZone: DropzoneType, metar: Metar, forecastData: list
@@ -50,7 +65,7 @@ def renderCurrentWeather(
                             "line-height": "1.2",
                         },
                     ),
-                    _renderCompass(dropZone),
+                    _renderCompass(metar),
                     html.Div(
                         style={
                             "backgroundColor": "rgba(47, 62, 70, 0)",
@@ -198,8 +213,7 @@ def _generate_compass_component(direction, speed, rotation) -> html.Div:
     )
 
 
-def _renderCompass(dropZone: DropzoneType) -> html.Div:
-    metar = weatherUtils.get_metar(dropZone.airportIdentifier.metarAirportIdentifier)
+def _renderCompass(metar: Metar.Metar) -> html.Div:
     if not metar:
         return None
     # Access the wind direction and speed
@@ -239,25 +253,19 @@ def _renderCompass(dropZone: DropzoneType) -> html.Div:
     )
 
 
-def renderWindTrends(dropZone: DropzoneType, historicalMetar: any) -> html.Div:
-    if not historicalMetar:
+def renderWindTrends(
+    dropZone: DropzoneType, metarHistory: MetarColumns | None
+) -> html.Div:
+    if metarHistory is None or not metarHistory.size:
         return None
-    # List of metar objects
-    df_historical = pd.DataFrame(
-        [
-            (
-                timeUtils.convert_utc_to_mst(metar.time).strftime("%-I:%M%p"),
-                int(metar.wind_speed.string("MPH").replace(" mph", ""))
-                if metar.wind_speed
-                else 0,
-                int(metar.wind_gust.string("MPH").replace(" mph", ""))
-                if metar.wind_gust
-                else 0,
-            )
-            for metar in historicalMetar
-        ],
-        columns=["time", "windspeed_10m", "windgusts_10m"],
-    ).iloc[::-1]
+    times = timeUtils.convert_utc_to_mst_array(metarHistory.time)
+    # Missing speeds and gusts read as calm
+    wind_speed = np.rint(
+        Metar.speed.convert(np.nan_to_num(metarHistory.wind_speed), "KT", "MPH")
+    )
+    wind_gust = np.rint(
+        Metar.speed.convert(np.nan_to_num(metarHistory.wind_gust), "KT", "MPH")
+    )
 
     return html.Div(
         style={
@@ -301,16 +309,16 @@ def renderWindTrends(dropZone: DropzoneType, historicalMetar: any) -> html.Div:
                 figure={
                     "data": [
                         {
-                            "x": df_historical["time"],
-                            "y": df_historical["windspeed_10m"],
+                            "x": times,
+                            "y": wind_speed,
                             "type": "line",
                             "hovertemplate": "Wind speed: %{y} mph<extra></extra>",
                             "line": {"width": 3, "shape": "spline"},
                             "name": "Wind Speed",
                         },
                         {
-                            "x": df_historical["time"],
-                            "y": df_historical["windgusts_10m"],
+                            "x": times,
+                            "y": wind_gust,
                             "type": "line",
                             "hovertemplate": "Wind gusts: %{y} mph<extra></extra>",
                             "line": {"width": 3, "shape": "spline"},
@@ -324,6 +332,8 @@ def renderWindTrends(dropZone: DropzoneType, historicalMetar: any) -> html.Div:
                         "font": {"color": "white"},
                         "xaxis": {
                             "gridcolor": "rgba(255,255,255,0.1)",
+                            "tickformat": "%-I:%M%p",
+                            "hoverformat": "%-I:%M%p",
                         },
                         "yaxis": {
                             "gridcolor": "rgba(255,255,255,0.1)",
@@ -703,15 +713,26 @@ def renderMetarError(airportIdentifier: str, friendlyName: str, id: str) -> html
     )
 
 
-def getAllComponents(dropZone: DropzoneType) -> list[html.Div]:
-    metar = weatherUtils.get_metar(dropZone.airportIdentifier.metarAirportIdentifier)
-    historicalMetar = weatherUtils.get_metar(
-        dropZone.airportIdentifier.metarAirportIdentifier, hours=4
+def gatherData(dropZone: DropzoneType) -> HomePageData:
+    # Fetch everything the home page needs at the same time so rendering
+    # waits on the slowest source rather than the sum of all of them
+    airportIdentifier = dropZone.airportIdentifier.metarAirportIdentifier
+    metar = _executor.submit(weatherUtils.get_metar, airportIdentifier)
+    metarHistory = _executor.submit(weatherUtils.get_metar_columns, airportIdentifier)
+    forecastData = _executor.submit(
+        weatherUtils.get_forecast,
+        FORECAST_NUM_HOURS,
+        dropZone.weatherGovGridpointLocation,
     )
-    forecastNumHours = 6
-    forecastData = weatherUtils.get_forecast(
-        forecastNumHours, dropZone.weatherGovGridpointLocation
+    return HomePageData(
+        metar.result(), metarHistory.result(), forecastData.result()
     )
+
+
+def getAllComponents(dropZone: DropzoneType) -> list[html.Div]:
+    # The calendar looks up today's date upstream, render it alongside
+    calendar = _executor.submit(calenderComponents.renderCalendarCurrentDay, dropZone)
+    metar, metarHistory, forecastData = gatherData(dropZone)
     return [
         (
             renderMetarError(
@@ -741,7 +762,7 @@ def getAllComponents(dropZone: DropzoneType) -> list[html.Div]:
                             if dropZone.liveManifestUrl
                             else None
                         ),
-                        calenderComponents.renderCalendarCurrentDay(dropZone),
+                        calendar.result(),
                     ],
                     md=6,
                 ),
@@ -749,13 +770,13 @@ def getAllComponents(dropZone: DropzoneType) -> list[html.Div]:
                     [
                         (
                             renderWeatherOutlook(
-                                dropZone, forecastData, forecastNumHours
+                                dropZone, forecastData, FORECAST_NUM_HOURS
                             )
                             if forecastData
                             else None
                         ),
                         renderAdsbInfo(dropZone),
-                        renderWindTrends(dropZone, historicalMetar),
+                        renderWindTrends(dropZone, metarHistory),
                     ],
                     md=6,
                 ),
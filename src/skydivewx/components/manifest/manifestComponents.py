@@ -1,18 +1,178 @@
-from dash import html
+import base64
+import hashlib
+import json
+import os
+from typing import NamedTuple
+
+from dash import dcc, html
 import dash_bootstrap_components as dbc
+import dash_mantine_components as dmc
+from flask import Response, abort, request
+from utils import burbleUtils, imageUtils, scheduler
+from utils.cacheUtils import shared_cache
+from utils.dropzones import dropzones
 from utils.dropzones.dropzoneUtils import DropzoneType
-from utils.screenshotUtils import getBurbleScreenshot
+from utils.screenshotUtils import capture_stats, getBurbleScreenshot
 from uuid import uuid1
 
+# How long a manifest screenshot is shown before it is captured again, in
+# seconds. Every viewer of a dropzone shares the same capture
+MANIFEST_REFRESH_INTERVAL = int(os.environ.get("SKYDIVEWX_MANIFEST_TTL", 60))
+# Experimental: render Burble's JSON load data as a table instead of the
+# screenshot. Off until the parser has been checked against a live response
+MANIFEST_DATA_ENABLED = os.environ.get("SKYDIVEWX_MANIFEST_DATA", "") == "1"
+
+
+def _captureManifest(liveManifestUrl: str) -> str:
+    screenshot = getBurbleScreenshot(liveManifestUrl)
+    if not screenshot:
+        # The capture timed out, keep showing the last one
+        raise RuntimeError(f"Could not load in manifest {liveManifestUrl}")
+    # Cropped, downscaled and encoded once here so the shared cache only
+    # holds what clients download
+    with capture_stats.timed("variants"):
+        variants, fingerprint = imageUtils.make_variants(base64.b64decode(screenshot))
+    return json.dumps(
+        {
+            "fingerprint": fingerprint,
+            "variants": {
+                f"{width}.{extension}": base64.b64encode(data).decode()
+                for (width, extension), data in variants.items()
+            },
+        }
+    )
+
+
+class ManifestImage(NamedTuple):
+    # (width, extension) -> encoded image
+    variants: dict[tuple[int, str], bytes]
+    etag: str
+    # Same for captures of an unchanged board
+    fingerprint: str
+
+    @property
+    def widths(self) -> list[int]:
+        return sorted(set(width for width, _ in self.variants))
+
+    def variant(self, width: int, extension: str) -> bytes | None:
+        # Smallest variant at least `width` wide, the largest one otherwise
+        widths = self.widths
+        width = next((w for w in widths if w >= width), widths[-1])
+        return self.variants.get((width, extension))
+
+
+def _manifestImage(payload: str) -> ManifestImage:
+    # Decoded once per capture rather than once per request
+    capture = json.loads(payload)
+    variants = {}
+    for name, data in capture["variants"].items():
+        width, extension = name.split(".")
+        variants[(int(width), extension)] = base64.b64decode(data)
+    return ManifestImage(
+        variants, hashlib.sha1(payload.encode()).hexdigest()[:16], capture["fingerprint"]
+    )
+
+
+# One capture in flight per liveManifestUrl, shared with every other worker
+# through the shared cache
+manifest_source = scheduler.DataSource(
+    "manifest",
+    lambda liveManifestUrl: _manifestImage(
+        shared_cache.fetch(
+            f"manifest:{liveManifestUrl}",
+            lambda: _captureManifest(liveManifestUrl),
+            max_age=MANIFEST_REFRESH_INTERVAL,
+            max_stale=10 * MANIFEST_REFRESH_INTERVAL,
+        )
+    ),
+    interval=MANIFEST_REFRESH_INTERVAL,
+)
+
+
+# Structured load board, the screenshot is only captured when this fails
+manifest_data_source = scheduler.DataSource(
+    "manifest-data",
+    lambda liveManifestUrl: burbleUtils.parse_manifest(
+        json.loads(
+            shared_cache.fetch(
+                f"manifest-data:{liveManifestUrl}",
+                lambda: burbleUtils.fetch_manifest_data(liveManifestUrl),
+                max_age=MANIFEST_REFRESH_INTERVAL,
+                max_stale=10 * MANIFEST_REFRESH_INTERVAL,
+            )
+        )
+    ),
+    interval=MANIFEST_REFRESH_INTERVAL,
+)
+
+
+def manifestImageUrl(
+    dropZone: DropzoneType, image: ManifestImage, width: int = None
+) -> str:
+    # Versioned by the capture's ETag so browsers cache every capture and
+    # only download a new one when the manifest changes
+    width = width or image.widths[0]
+    return f"/manifest-image/{dropZone.id}?v={image.etag}&w={width}"
+
+
+def manifestImageSrcSet(dropZone: DropzoneType, image: ManifestImage) -> str:
+    return ", ".join(
+        f"{manifestImageUrl(dropZone, image, width)} {width}w"
+        for width in image.widths
+    )
+
+
+def register_routes(server) -> None:
+    """Serve the latest manifest capture of every dropzone from
+    /manifest-image/<dz_id> on the given Flask `server`"""
+
+    @server.route("/manifest-image/<dz_id>")
+    def manifest_image(dz_id: str):
+        dropZone = dropzones.Dropzones.get_dropzone_by_id(dz_id)
+        if dropZone is None or not dropZone.liveManifestUrl:
+            abort(404)
+        image = manifest_source.read(dropZone.liveManifestUrl)
+        if image is None:
+            abort(404)
+        width = request.args.get("w", 0, type=int)
+        for _, mimetype, extension in imageUtils.FORMATS:
+            # WebP for the browsers that accept it, JPEG for the rest
+            data = image.variant(width, extension)
+            if data is not None and (
+                request.accept_mimetypes[mimetype]
+                or extension == imageUtils.FORMATS[-1][2]
+            ):
+                break
+        if data is None:
+            abort(404)
+        response = Response(data, mimetype=mimetype)
+        response.set_etag(f"{image.etag}-{width}.{extension}")
+        response.vary.add("Accept")
+        if request.args.get("v") == image.etag:
+            # A versioned URL always points at the same bytes
+            response.cache_control.public = True
+            response.cache_control.max_age = 24 * 60 * 60
+            response.cache_control.immutable = True
+        else:
+            response.cache_control.public = True
+            response.cache_control.max_age = MANIFEST_REFRESH_INTERVAL
+        return response.make_conditional(request)
+
 
 def screenshotImage(
     dropZone: DropzoneType,
     width: any = "100%",
     height: any = "100%",
     includeLink: bool = False,
+    capture: ManifestImage | None = None,
 ) -> html.Div:
+    if capture is None:
+        capture = manifest_source.read(dropZone.liveManifestUrl)
     image = html.Img(
-        src="data:image/png;base64, " + getBurbleScreenshot(dropZone.liveManifestUrl),
+        src=manifestImageUrl(dropZone, capture) if capture else "",
+        srcSet=manifestImageSrcSet(dropZone, capture) if capture else "",
+        # The manifest card is at most 550px wide, see homePageComponents
+        sizes="(max-width: 550px) 100vw, 550px",
         width=width,
         height=height,
     )
@@ -26,15 +186,113 @@ def screenshotImage(
         return image
 
 
+def _callTime(load: burbleUtils.ManifestLoad) -> str:
+    if load.call_minutes is None:
+        return load.status or ""
+    if load.call_minutes <= 0:
+        return "Now"
+    return f"{load.call_minutes} min"
+
+
+def manifestTable(loads: list[burbleUtils.ManifestLoad]) -> html.Div:
+    if not loads:
+        return html.Div("No loads on the manifest", style={"color": "white"})
+    return dmc.Table(
+        [
+            html.Thead(
+                html.Tr(
+                    [
+                        html.Th("Load", style={"color": "white"}),
+                        html.Th("Aircraft", style={"color": "white"}),
+                        html.Th("Call", style={"color": "white"}),
+                        html.Th("Slots Left", style={"color": "white"}),
+                    ],
+                )
+            ),
+            html.Tbody(
+                [
+                    html.Tr(
+                        [
+                            html.Td(load.number),
+                            html.Td(load.aircraft or ""),
+                            html.Td(_callTime(load)),
+                            html.Td(
+                                "" if load.slots_left is None else load.slots_left
+                            ),
+                        ]
+                    )
+                    for load in loads
+                ]
+            ),
+        ],
+        horizontalSpacing=2,
+        style={
+            "color": "white",
+            "width": "100%",
+            "table-layout": "fixed",
+            "word-wrap": "break-word",
+        },
+    )
+
+
+class ManifestBoard(NamedTuple):
+    # Burble's load board when its data could be read, the capture otherwise
+    loads: list[burbleUtils.ManifestLoad] | None
+    capture: ManifestImage | None
+
+
+def manifestBoard(dropZone: DropzoneType) -> ManifestBoard:
+    """Latest board of `dropZone`, read once per update and handed to both
+    `manifestVersion` and `manifestView`"""
+    # A failed fetch is remembered by the source until its next scheduled
+    # refresh, so clients fall through to the screenshot without waiting on
+    # Burble. Loads that stopped updating are not shown as if they were live
+    data = (
+        manifest_data_source.snapshot(dropZone.liveManifestUrl)
+        if MANIFEST_DATA_ENABLED
+        else None
+    )
+    if data is not None and not data.stale:
+        return ManifestBoard(data.value, None)
+    return ManifestBoard(None, manifest_source.read(dropZone.liveManifestUrl))
+
+
+def manifestVersion(board: ManifestBoard) -> str | None:
+    """Fingerprint of the board `manifestView` renders, None while there is
+    nothing to show"""
+    if board.loads is not None:
+        return "data-" + hashlib.sha1(repr(board.loads).encode()).hexdigest()[:16]
+    if board.capture is not None:
+        return "image-" + board.capture.fingerprint
+    return None
+
+
+def manifestView(dropZone: DropzoneType, board: ManifestBoard) -> html.Div:
+    # Native table from Burble's data, a screenshot of the board otherwise
+    if board.loads is not None:
+        return manifestTable(board.loads)
+    return screenshotImage(dropZone, capture=board.capture)
+
+
 def getScreenshotImageContainer() -> html.Div:
     return html.Div(
-        children=[
+        [
+            # Version of the board this client last received
+            dcc.Store(id="live-manifest-version"),
             html.Div(
-                dbc.Spinner(color="primary"),
-                style={"width": "100%", "textAlign": "center", "padding-top": "20px"},
-            )
-        ],
-        id="live-manifest-image-container",
+                children=[
+                    html.Div(
+                        dbc.Spinner(color="primary"),
+                        style={
+                            "width": "100%",
+                            "textAlign": "center",
+                            "padding-top": "20px",
+                        },
+                    )
+                ],
+                id="live-manifest-image-container",
+            ),
+        ]
     )
 
 
@@ -1,18 +1,26 @@
 import json
 
-import requests
 from dash import dash_table, dcc, html
 from plotly.graph_objs import Scatter
 from utils.dropzones.dropzoneUtils import DropzoneType
-from utils import timeUtils, weatherUtils
+from utils import httpUtils, scheduler, timeUtils, weatherUtils
+from utils.cacheUtils import shared_cache
 import dash_mantine_components as dmc
 
+# Winds aloft are published hourly
+WINDS_REFRESH_INTERVAL = 10 * 60
+
 
 def _get_data(lat: str, long: str) -> dict:
-    # Getting the data from the url
+    # Getting the data from the url, or from disk when another process
+    # fetched it recently
     url = f"https://markschulze.net/winds/winds.php?lat={lat}&lon={long}&hourOffset=0&referrer=SkydiveUtah"
-    response = requests.get(url)
-    return response.json()
+    payload = shared_cache.fetch(
+        f"winds:{lat},{long}",
+        lambda: httpUtils.get(url).text,
+        max_age=WINDS_REFRESH_INTERVAL,
+    )
+    return json.loads(payload)
 
 
 def _render_table(data) -> dmc.Table:
@@ -88,11 +96,17 @@ def _handleWindsData(data) -> dict:
     return data
 
 
+winds_source = scheduler.DataSource(
+    "winds-aloft",
+    lambda location: _handleWindsData(_get_data(*location)),
+    interval=WINDS_REFRESH_INTERVAL,
+)
+
+
 def renderWindsAloft(dropZone: DropzoneType) -> html.Div:
-    winds_aloft_data = _get_data(
-        dropZone.geoLocation.latitude, dropZone.geoLocation.longitude
+    winds_aloft_data = winds_source.read(
+        (dropZone.geoLocation.latitude, dropZone.geoLocation.longitude)
     )
-    winds_aloft_data = _handleWindsData(winds_aloft_data)
     metar = weatherUtils.get_metar(dropZone.airportIdentifier.metarAirportIdentifier)
 
     # # UNCOMMENT FOR "DISJOINTED" WIND DIRECTION TEST DATA
@@ -0,0 +1,209 @@
+import atexit
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Iterator
+
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+
+# Browsers kept warm per worker process
+POOL_SIZE = int(os.environ.get("SKYDIVEWX_BROWSER_POOL_SIZE", 2))
+# Captures served by one browser before it is replaced, keeps slow leaks in
+# long running Chrome sessions in check
+MAX_USES = 50
+# Longest a capture waits for a free browser, in seconds
+MAX_WAIT = 30
+# Longest a navigation may take before it raises TimeoutException, in seconds.
+# Selenium's default is five minutes
+PAGE_LOAD_TIMEOUT = 30
+
+
+# Injected into every page before its own scripts run, counts the XHR and
+# fetch requests in flight so callers can wait for the network to go idle
+NETWORK_TRACKER_SCRIPT = """
+(function () {
+    window.__pendingRequests = 0;
+    window.__lastNetworkActivity = performance.now();
+    function started() {
+        window.__pendingRequests++;
+        window.__lastNetworkActivity = performance.now();
+    }
+    function finished() {
+        window.__pendingRequests = Math.max(0, window.__pendingRequests - 1);
+        window.__lastNetworkActivity = performance.now();
+    }
+    var send = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function () {
+        started();
+        this.addEventListener("loadend", finished);
+        return send.apply(this, arguments);
+    };
+    if (window.fetch) {
+        var fetch = window.fetch;
+        window.fetch = function () {
+            started();
+            return fetch.apply(this, arguments).finally(finished);
+        };
+    }
+})();
+"""
+
+
+class BrowserPoolTimeout(Exception):
+    """Raised when no browser became free within the pool's max wait."""
+
+    pass
+
+
+def _create_chrome() -> webdriver.Chrome:
+    chrome_options = Options()
+    chrome_options.add_argument("--headless")
+    chrome_options.add_argument("--window-size=1920,1080")
+    chrome_options.add_argument("--disable-gpu")
+    chrome_options.add_argument("--disable-dev-shm-usage")
+    driver = webdriver.Chrome(options=chrome_options)
+    driver.set_page_load_timeout(PAGE_LOAD_TIMEOUT)
+    driver.execute_cdp_cmd(
+        "Page.addScriptToEvaluateOnNewDocument", {"source": NETWORK_TRACKER_SCRIPT}
+    )
+    return driver
+
+
+class _Browser:
+    def __init__(self, driver: webdriver.Remote) -> None:
+        self.driver = driver
+        self.uses = 0
+
+
+class BrowserPool:
+    """Bounded pool of warm headless browsers.
+
+    `checkout()` hands out an idle browser, starting a new one while fewer
+    than `size` exist, or waits up to `max_wait` seconds for one to be
+    returned. Browsers are health checked before every checkout and replaced
+    after `max_uses` captures or as soon as they misbehave."""
+
+    def __init__(
+        self,
+        size: int = POOL_SIZE,
+        max_uses: int = MAX_USES,
+        max_wait: float = MAX_WAIT,
+        create: Callable[[], webdriver.Remote] = _create_chrome,
+    ) -> None:
+        self.size = size
+        self.max_uses = max_uses
+        self.max_wait = max_wait
+        self.create = create
+        self.created = 0
+        self.recycled = 0
+        self.timeouts = 0
+        self._idle: list[_Browser] = []
+        self._count = 0
+        self._pid = os.getpid()
+        self._condition = threading.Condition()
+
+    def _reset_after_fork(self) -> None:
+        # Browsers belong to the process that started them, a forked worker
+        # starts its own
+        if self._pid != os.getpid():
+            self._pid = os.getpid()
+            self._idle = []
+            self._count = 0
+
+    def _acquire(self) -> _Browser | None:
+        # An idle browser, or None once the caller may start a new one
+        deadline = time.monotonic() + self.max_wait
+        with self._condition:
+            self._reset_after_fork()
+            while not self._idle and self._count >= self.size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self.timeouts += 1
+                    raise BrowserPoolTimeout(
+                        f"No browser free after waiting {self.max_wait} seconds"
+                    )
+                self._condition.wait(remaining)
+            if self._idle:
+                return self._idle.pop()
+            self._count += 1
+            return None
+
+    def _discard(self, browser: _Browser | None) -> None:
+        if browser is not None:
+            try:
+                browser.driver.quit()
+            except Exception as e:
+                print(f"Could not quit browser: {e}")
+        with self._condition:
+            self._count -= 1
+            self._condition.notify()
+
+    def _healthy(self, browser: _Browser) -> bool:
+        try:
+            return browser.driver.execute_script("return 1") == 1
+        except Exception:
+            return False
+
+    def _get(self) -> _Browser:
+        while True:
+            browser = self._acquire()
+            if browser is None:
+                try:
+                    browser = _Browser(self.create())
+                except Exception:
+                    self._discard(None)
+                    raise
+                self.created += 1
+                return browser
+            if self._healthy(browser):
+                return browser
+            self.recycled += 1
+            self._discard(browser)
+
+    def _put(self, browser: _Browser, healthy: bool) -> None:
+        browser.uses += 1
+        if not healthy or browser.uses >= self.max_uses:
+            self.recycled += 1
+            self._discard(browser)
+            return
+        with self._condition:
+            if self._pid != os.getpid():
+                return
+            self._idle.append(browser)
+            self._condition.notify()
+
+    @contextmanager
+    def checkout(self) -> Iterator[webdriver.Remote]:
+        """Borrow a browser for the duration of the with block. A browser is
+        returned to the pool unless the block raised an exception, in which
+        case it is replaced."""
+        browser = self._get()
+        healthy = False
+        try:
+            yield browser.driver
+            healthy = True
+        finally:
+            self._put(browser, healthy)
+
+    def close(self) -> None:
+        with self._condition:
+            idle, self._idle = self._idle, []
+        for browser in idle:
+            self._discard(browser)
+
+    def stats(self) -> dict:
+        with self._condition:
+            return {
+                "size": self.size,
+                "open": self._count,
+                "idle": len(self._idle),
+                "created": self.created,
+                "recycled": self.recycled,
+                "timeouts": self.timeouts,
+            }
+
+
+browser_pool = BrowserPool()
+atexit.register(browser_pool.close)
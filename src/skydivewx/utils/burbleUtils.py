@@ -0,0 +1,111 @@
+import json
+from typing import Any, NamedTuple
+from urllib.parse import parse_qs, urlparse
+
+from utils import httpUtils
+
+# Backing request the public jmp?dz_id= page loads its board from
+BURBLE_MANIFEST_DATA_URL = (
+    "https://dzm.burblesoft.com/ajax_dzm2_frontend_jumpermanifestpublic"
+)
+
+
+class ManifestLoad(NamedTuple):
+    number: str
+    aircraft: str | None
+    # Minutes until the load is called, None once it has no call time
+    call_minutes: int | None
+    slots_left: int | None
+    status: str | None
+
+
+class ManifestFormatError(Exception):
+    """Raised when Burble answers with something that is not a load board."""
+
+    pass
+
+
+def get_dz_id(liveManifestUrl: str) -> str | None:
+    # https://dzm.burblesoft.com/jmp?dz_id=<ID>&...
+    values = parse_qs(urlparse(liveManifestUrl).query).get("dz_id")
+    return values[0] if values else None
+
+
+def _first(load: dict, *keys: str) -> Any:
+    # Burble has renamed fields before, take the first one present
+    for key in keys:
+        value = load.get(key)
+        if value not in (None, ""):
+            return value
+    return None
+
+
+def _to_int(value: Any) -> int | None:
+    try:
+        return int(float(value))
+    except (TypeError, ValueError):
+        return None
+
+
+def _slots_left(load: dict) -> int | None:
+    slots_left = _to_int(_first(load, "slots_left", "open_slots", "available_slots"))
+    if slots_left is not None:
+        return slots_left
+    total = _to_int(_first(load, "total_slots", "max_slots", "slots"))
+    taken = _to_int(_first(load, "used_slots", "booked_slots", "jumper_count"))
+    if total is None or taken is None:
+        return None
+    return max(0, total - taken)
+
+
+def parse_manifest(payload: Any) -> list[ManifestLoad]:
+    """Loads in board order from a decoded Burble manifest response.
+
+    Unknown fields are ignored and missing ones left as None, a load is only
+    skipped when it has no number at all. ManifestFormatError is raised if
+    the payload holds no list of loads, or if none of its entries reads as
+    a load, so callers fall back to a screenshot instead of showing an
+    empty board."""
+    if isinstance(payload, dict):
+        payload = _first(payload, "loads", "data", "manifest")
+    if not isinstance(payload, list):
+        raise ManifestFormatError("Burble response has no list of loads")
+    loads = []
+    for load in payload:
+        if not isinstance(load, dict):
+            continue
+        # Not "id", that is Burble's database key rather than the load number
+        number = _first(load, "name", "load_number", "number")
+        if number is None:
+            continue
+        aircraft = _first(load, "plane_name", "aircraft_name", "aircraft", "plane")
+        status = _first(load, "status", "status_name")
+        loads.append(
+            ManifestLoad(
+                number=str(number),
+                aircraft=None if aircraft is None else str(aircraft),
+                call_minutes=_to_int(_first(load, "time_left", "call_time", "minutes")),
+                slots_left=_slots_left(load),
+                status=None if status is None else str(status),
+            )
+        )
+    if payload and not loads:
+        raise ManifestFormatError("Burble response has no recognisable loads")
+    return loads
+
+
+def fetch_manifest_data(liveManifestUrl: str) -> str:
+    """Raw JSON board of the dropzone behind `liveManifestUrl`. Raises on any
+    upstream or format problem so callers can fall back to a screenshot"""
+    dz_id = get_dz_id(liveManifestUrl)
+    if dz_id is None:
+        raise ManifestFormatError(f"No dz_id in {liveManifestUrl}")
+    response = httpUtils.post(
+        BURBLE_MANIFEST_DATA_URL,
+        data={"dz_id": dz_id},
+        headers={"X-Requested-With": "XMLHttpRequest"},
+    )
+    response.raise_for_status()
+    # Validate before the payload is cached and shared
+    parse_manifest(json.loads(response.text))
+    return response.text
@@ -0,0 +1,459 @@
+import hashlib
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Callable, ContextManager, Hashable, Iterator, NamedTuple
+
+try:
+    import fcntl
+except ImportError:
+    # Windows, fall back to locking within a single process
+    fcntl = None
+
+# Raw payloads older than this are never served, even when upstream is down
+MAX_STALE = 24 * 60 * 60
+
+# Seconds a Redis lock outlives a holder that stopped extending it
+REDIS_LOCK_TIMEOUT = 60
+
+
+class CacheEntry(NamedTuple):
+    value: Any
+    age: float
+    stale: bool
+
+
+class TTLCache:
+    """Thread safe, process wide key/value cache where every entry expires
+    after its own time-to-live (in seconds).
+
+    Expired entries are kept around for another `stale_ttl` seconds so they
+    can be served (marked stale) while the upstream is being refreshed or is
+    unavailable."""
+
+    def __init__(self, ttl: float = 300, maxsize: int = 256, stale_ttl: float = 0):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.stale_ttl = stale_ttl
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self._entries: dict[Hashable, tuple[float, float, Any]] = {}
+        self._refreshing: set[Hashable] = set()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        entry = self.get_entry(key, allow_stale=False)
+        return default if entry is None else entry.value
+
+    def get_entry(self, key: Hashable, allow_stale: bool = True) -> CacheEntry | None:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] + self.stale_ttl <= now:
+                del self._entries[key]
+                entry = None
+            if entry is None or (entry[0] <= now and not allow_stale):
+                self.misses += 1
+                return None
+            expires, stored_at, value = entry
+            stale = expires <= now
+            if stale:
+                self.stale_hits += 1
+            else:
+                self.hits += 1
+            return CacheEntry(value, now - stored_at, stale)
+
+    def set(self, key: Hashable, value: Any, ttl: float = None) -> None:
+        now = time.monotonic()
+        expires = now + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._entries[key] = (expires, now, value)
+            if len(self._entries) > self.maxsize:
+                self._purge()
+
+    def refresh_in_background(
+        self, key: Hashable, fetch: Callable[[], Any], ttl: Callable[[], float]
+    ) -> None:
+        """Re-fetch `key` on a separate thread, at most once at a time per key.
+        Failed or empty fetches leave the current entry in place."""
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+
+        def _refresh():
+            try:
+                value = fetch()
+                if value is not None:
+                    self.set(key, value, ttl=ttl())
+            except Exception as e:
+                print(f"Background refresh of {key} failed: {e}")
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        threading.Thread(target=_refresh, daemon=True).start()
+
+    def evict(self, key: Hashable) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "stale_hits": self.stale_hits,
+                "misses": self.misses,
+                "size": len(self._entries),
+            }
+
+    def _purge(self) -> None:
+        # Drop anything past its stale window first, then the entries closest
+        # to expiring
+        now = time.monotonic()
+        for key in [
+            k for k, (exp, _, _) in self._entries.items() if exp + self.stale_ttl <= now
+        ]:
+            del self._entries[key]
+        overflow = len(self._entries) - self.maxsize
+        if overflow > 0:
+            by_expiry = sorted(self._entries, key=lambda k: self._entries[k][0])
+            for key in by_expiry[:overflow]:
+                del self._entries[key]
+
+
+class CacheRecord(NamedTuple):
+    payload: str
+    fetched_at: float
+    etag: str | None = None
+    last_modified: str | None = None
+    expires: float = 0
+
+    @property
+    def age(self) -> float:
+        return time.time() - self.fetched_at
+
+
+class _KeyedLocks:
+    # One lock per key, for the threads of this process
+    def __init__(self) -> None:
+        self._locks: dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, key: str) -> threading.Lock:
+        with self._lock:
+            return self._locks.setdefault(key, threading.Lock())
+
+
+class CacheBackend:
+    """Store of raw upstream payloads, their fetch time and HTTP validators.
+
+    Subclasses implement `get`, `set` and `lock`. The memory backend is per
+    process, the file and Redis backends are shared by every worker (and, for
+    Redis, every machine) so an upstream result is fetched once and reused."""
+
+    def get(self, key: str) -> CacheRecord | None:
+        raise NotImplementedError
+
+    def set(
+        self,
+        key: str,
+        payload: str,
+        etag: str = None,
+        last_modified: str = None,
+        expires: float = 0,
+        fetched_at: float = None,
+    ) -> None:
+        raise NotImplementedError
+
+    def lock(self, key: str) -> ContextManager:
+        """Held while `key` is being fetched so concurrent callers wait for
+        that fetch instead of starting their own"""
+        raise NotImplementedError
+
+    def fetch(
+        self,
+        key: str,
+        fetch: Callable[[], str],
+        max_age: float,
+        max_stale: float = MAX_STALE,
+    ) -> str:
+        """Payload stored under `key` if it is younger than `max_age` seconds,
+        otherwise `fetch()` it and store the result. When fetching fails the
+        stored payload is returned instead as long as it is younger than
+        `max_stale` seconds."""
+        record = self.get(key)
+        if record and record.age < max_age:
+            return record.payload
+        with self.lock(key):
+            # Somebody else may have fetched it while we waited
+            record = self.get(key) or record
+            if record and record.age < max_age:
+                return record.payload
+            try:
+                payload = fetch()
+            except Exception:
+                if record and record.age < max_stale:
+                    return record.payload
+                raise
+            self.set(key, payload)
+            return payload
+
+
+class MemoryBackend(CacheBackend):
+    """Least recently used, in process cache"""
+
+    def __init__(self, maxsize: int = 512) -> None:
+        self.maxsize = maxsize
+        self._records: OrderedDict[str, CacheRecord] = OrderedDict()
+        self._locks = _KeyedLocks()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> CacheRecord | None:
+        with self._lock:
+            record = self._records.get(key)
+            if record is not None:
+                self._records.move_to_end(key)
+            return record
+
+    def set(
+        self,
+        key: str,
+        payload: str,
+        etag: str = None,
+        last_modified: str = None,
+        expires: float = 0,
+        fetched_at: float = None,
+    ) -> None:
+        fetched_at = time.time() if fetched_at is None else fetched_at
+        with self._lock:
+            self._records[key] = CacheRecord(
+                payload, fetched_at, etag, last_modified, expires
+            )
+            self._records.move_to_end(key)
+            while len(self._records) > self.maxsize:
+                self._records.popitem(last=False)
+
+    def lock(self, key: str) -> ContextManager:
+        return self._locks(key)
+
+
+class FileBackend(CacheBackend):
+    """SQLite file shared by every worker process on this machine. Survives
+    worker restarts so a fresh process starts warm."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._local = threading.local()
+        self._thread_locks = _KeyedLocks()
+        try:
+            with self._connection() as connection:
+                connection.execute(
+                    """CREATE TABLE IF NOT EXISTS entries (
+                        key TEXT PRIMARY KEY,
+                        payload TEXT NOT NULL,
+                        fetched_at REAL NOT NULL,
+                        etag TEXT,
+                        last_modified TEXT,
+                        expires REAL NOT NULL DEFAULT 0
+                    )"""
+                )
+        except sqlite3.Error as e:
+            # Not fatal, every read will just miss
+            print(f"Could not open cache file at {path}: {e}")
+
+    def _connection(self) -> sqlite3.Connection:
+        # sqlite3 connections can't be shared between threads or processes
+        connection = getattr(self._local, "connection", None)
+        if connection is None or self._local.pid != os.getpid():
+            connection = sqlite3.connect(self.path, timeout=5)
+            connection.execute("PRAGMA journal_mode=WAL")
+            self._local.connection = connection
+            self._local.pid = os.getpid()
+        return connection
+
+    def get(self, key: str) -> CacheRecord | None:
+        try:
+            row = (
+                self._connection()
+                .execute(
+                    "SELECT payload, fetched_at, etag, last_modified, expires"
+                    " FROM entries WHERE key = ?",
+                    (key,),
+                )
+                .fetchone()
+            )
+        except sqlite3.Error as e:
+            print(f"Cache file read of {key} failed: {e}")
+            return None
+        return CacheRecord(*row) if row else None
+
+    def set(
+        self,
+        key: str,
+        payload: str,
+        etag: str = None,
+        last_modified: str = None,
+        expires: float = 0,
+        fetched_at: float = None,
+    ) -> None:
+        fetched_at = time.time() if fetched_at is None else fetched_at
+        try:
+            with self._connection() as connection:
+                connection.execute(
+                    "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?)",
+                    (key, payload, fetched_at, etag, last_modified, expires),
+                )
+        except sqlite3.Error as e:
+            print(f"Cache file write of {key} failed: {e}")
+
+    @contextmanager
+    def lock(self, key: str) -> Iterator[None]:
+        # Threads of this process queue up on a regular lock, processes on an
+        # advisory lock file next to the database
+        with self._thread_locks(key):
+            if fcntl is None:
+                yield
+                return
+            digest = hashlib.sha1(key.encode()).hexdigest()
+            try:
+                lock_file = open(f"{self.path}.{digest}.lock", "w")
+            except OSError:
+                yield
+                return
+            with lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+class RedisBackend(CacheBackend):
+    """Redis server shared by every worker on every machine"""
+
+    def __init__(self, url: str, prefix: str = "skydivewx:") -> None:
+        try:
+            import redis
+        except ImportError:
+            raise ImportError(
+                "The redis cache backend needs the redis package, pip install redis"
+            )
+        self.client = redis.Redis.from_url(url)
+        self.prefix = prefix
+
+    def get(self, key: str) -> CacheRecord | None:
+        try:
+            fields = self.client.hgetall(self.prefix + key)
+        except Exception as e:
+            print(f"Redis read of {key} failed: {e}")
+            return None
+        if not fields:
+            return None
+        fields = {k.decode(): v.decode() for k, v in fields.items()}
+        return CacheRecord(
+            fields["payload"],
+            float(fields["fetched_at"]),
+            fields.get("etag") or None,
+            fields.get("last_modified") or None,
+            float(fields.get("expires", 0)),
+        )
+
+    def set(
+        self,
+        key: str,
+        payload: str,
+        etag: str = None,
+        last_modified: str = None,
+        expires: float = 0,
+        fetched_at: float = None,
+    ) -> None:
+        fetched_at = time.time() if fetched_at is None else fetched_at
+        try:
+            pipeline = self.client.pipeline()
+            pipeline.delete(self.prefix + key)
+            pipeline.hset(
+                self.prefix + key,
+                mapping={
+                    "payload": payload,
+                    "fetched_at": fetched_at,
+                    "etag": etag or "",
+                    "last_modified": last_modified or "",
+                    "expires": expires,
+                },
+            )
+            # Nothing older than MAX_STALE is ever served
+            pipeline.expire(self.prefix + key, MAX_STALE)
+            pipeline.execute()
+        except Exception as e:
+            print(f"Redis write of {key} failed: {e}")
+
+    @contextmanager
+    def lock(self, key: str) -> Iterator[None]:
+        # Expires on its own should the holder die mid fetch, and is extended
+        # for as long as the fetch runs since some take minutes
+        lock = self.client.lock(
+            f"{self.prefix}lock:{key}",
+            timeout=REDIS_LOCK_TIMEOUT,
+            blocking_timeout=30,
+        )
+        try:
+            acquired = lock.acquire()
+        except Exception as e:
+            print(f"Redis lock of {key} failed: {e}")
+            acquired = False
+        if not acquired:
+            # Fetching twice beats failing the caller
+            print(f"Fetching {key} without holding its Redis lock")
+            yield
+            return
+        done = threading.Event()
+
+        def _extend():
+            while not done.wait(REDIS_LOCK_TIMEOUT / 3):
+                try:
+                    lock.reacquire()
+                except Exception as e:
+                    print(f"Extending the Redis lock of {key} failed: {e}")
+                    return
+
+        threading.Thread(target=_extend, daemon=True).start()
+        try:
+            yield
+        finally:
+            done.set()
+            try:
+                lock.release()
+            except Exception as e:
+                # Lost it to expiry, the fetched payload is still good
+                print(f"Redis lock of {key} was released early: {e}")
+
+
+def _create_backend() -> CacheBackend:
+    backend = os.environ.get("SKYDIVEWX_CACHE_BACKEND", "file").lower()
+    if backend == "memory":
+        return MemoryBackend()
+    if backend == "redis":
+        return RedisBackend(
+            os.environ.get("SKYDIVEWX_REDIS_URL", "redis://localhost:6379/0")
+        )
+    return FileBackend(
+        os.environ.get(
+            "SKYDIVEWX_CACHE_PATH",
+            os.path.join(tempfile.gettempdir(), "skydivewx-cache.sqlite3"),
+        )
+    )
+
+
+# Raw upstream payloads, shared across workers unless the memory backend is
+# configured
+shared_cache = _create_backend()
@@ -0,0 +1,246 @@
+import random
+import threading
+import time
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# (connect, read) timeouts in seconds for every upstream request
+CONNECT_TIMEOUT = 3.05
+READ_TIMEOUT = 10
+# Retries after the first attempt, with jittered exponential backoff
+MAX_RETRIES = 3
+BACKOFF_BASE = 0.5
+BACKOFF_MAX = 8
+# Keep-alive connections kept open and requests in flight, per upstream host
+POOL_SIZE = 10
+MAX_CONCURRENCY_PER_HOST = 4
+
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+# Consecutive failed requests before a host's circuit opens, and how long it
+# stays open before a single trial request is let through
+BREAKER_FAILURE_THRESHOLD = 3
+BREAKER_RESET_TIMEOUT = 60
+
+
+class UpstreamError(Exception):
+    """Raised when an upstream could not be reached after every retry."""
+
+    pass
+
+
+class CircuitOpenError(UpstreamError):
+    """Raised without contacting the upstream while its circuit is open."""
+
+    pass
+
+
+class CircuitBreaker:
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half-open"
+
+    def __init__(
+        self,
+        failure_threshold: int = BREAKER_FAILURE_THRESHOLD,
+        reset_timeout: float = BREAKER_RESET_TIMEOUT,
+    ) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = CircuitBreaker.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == CircuitBreaker.CLOSED:
+                return True
+            if self.state == CircuitBreaker.OPEN:
+                if time.monotonic() - self.opened_at < self.reset_timeout:
+                    return False
+                self.state = CircuitBreaker.HALF_OPEN
+            # Half open, only one trial request at a time
+            if self._trial_in_flight:
+                return False
+            self._trial_in_flight = True
+            return True
+
+    def succeeded(self) -> None:
+        with self._lock:
+            self.state = CircuitBreaker.CLOSED
+            self.failures = 0
+            self._trial_in_flight = False
+
+    def failed(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if (
+                self.state == CircuitBreaker.HALF_OPEN
+                or self.failures >= self.failure_threshold
+            ):
+                self.state = CircuitBreaker.OPEN
+                self.opened_at = time.monotonic()
+            self._trial_in_flight = False
+
+
+class HostStats:
+    def __init__(self) -> None:
+        self.requests = 0
+        self.failures = 0
+        self.retries = 0
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+        self.last_latency = 0.0
+
+    def record(self, latency: float, failed: bool) -> None:
+        self.requests += 1
+        self.failures += int(failed)
+        self.total_latency += latency
+        self.max_latency = max(self.max_latency, latency)
+        self.last_latency = latency
+
+    def get(self) -> dict:
+        return {
+            "requests": self.requests,
+            "failures": self.failures,
+            "retries": self.retries,
+            "avg_latency": self.total_latency / self.requests if self.requests else 0,
+            "max_latency": self.max_latency,
+            "last_latency": self.last_latency,
+        }
+
+
+class _Host:
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=POOL_SIZE)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.slots = threading.BoundedSemaphore(MAX_CONCURRENCY_PER_HOST)
+        self.breaker = CircuitBreaker()
+        self.stats = HostStats()
+        self.lock = threading.Lock()
+
+
+_hosts: dict[str, _Host] = {}
+_hosts_lock = threading.Lock()
+
+
+def _host(url: str) -> _Host:
+    name = urlparse(url).netloc
+    with _hosts_lock:
+        if name not in _hosts:
+            _hosts[name] = _Host(name)
+        return _hosts[name]
+
+
+def backoff_delay(attempt: int) -> float:
+    # "Full jitter" exponential backoff
+    return random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2**attempt))
+
+
+def get(
+    url: str,
+    params: dict = None,
+    headers: dict = None,
+    timeout: tuple[float, float] = (CONNECT_TIMEOUT, READ_TIMEOUT),
+    retries: int = MAX_RETRIES,
+) -> requests.Response:
+    """GET `url` through the shared connection pool of its host.
+
+    Connection errors, timeouts and 429/5xx responses are retried with
+    jittered exponential backoff, UpstreamError is raised once retries run
+    out. Any other response (including 304 and 4xx) is returned as is.
+
+    Hosts that keep failing have their circuit opened, CircuitOpenError is
+    then raised straight away until the host is given another try."""
+    return _request("GET", url, params, None, headers, timeout, retries)
+
+
+def post(
+    url: str,
+    data: dict = None,
+    headers: dict = None,
+    timeout: tuple[float, float] = (CONNECT_TIMEOUT, READ_TIMEOUT),
+    retries: int = MAX_RETRIES,
+) -> requests.Response:
+    """POST form `data` to `url`, with the same pooling, retries and circuit
+    breaking as `get`. Only meant for idempotent requests, such as reads
+    behind a form endpoint, since failed attempts are sent again."""
+    return _request("POST", url, None, data, headers, timeout, retries)
+
+
+def _request(
+    method: str,
+    url: str,
+    params: dict,
+    data: dict,
+    headers: dict,
+    timeout: tuple[float, float],
+    retries: int,
+) -> requests.Response:
+    host = _host(url)
+    if not host.breaker.allow():
+        raise CircuitOpenError(f"Circuit for {host.name} is {host.breaker.state}")
+    try:
+        response = _request_with_retries(
+            host, method, url, params, data, headers, timeout, retries
+        )
+    except Exception:
+        host.breaker.failed()
+        raise
+    host.breaker.succeeded()
+    return response
+
+
+def _request_with_retries(
+    host: _Host,
+    method: str,
+    url: str,
+    params: dict,
+    data: dict,
+    headers: dict,
+    timeout: tuple[float, float],
+    retries: int,
+) -> requests.Response:
+    error = None
+    for attempt in range(retries + 1):
+        if attempt:
+            with host.lock:
+                host.stats.retries += 1
+            time.sleep(backoff_delay(attempt - 1))
+        if not host.slots.acquire(timeout=timeout[0] + timeout[1]):
+            error = UpstreamError(f"Too many requests in flight to {host.name}")
+            continue
+        started = time.monotonic()
+        response = None
+        try:
+            response = host.session.request(
+                method, url, params=params, data=data, headers=headers, timeout=timeout
+            )
+        except requests.RequestException as e:
+            error = e
+        finally:
+            host.slots.release()
+            failed = response is None or response.status_code in RETRY_STATUS_CODES
+            with host.lock:
+                host.stats.record(time.monotonic() - started, failed)
+        if response is not None:
+            if response.status_code not in RETRY_STATUS_CODES:
+                return response
+            error = UpstreamError(f"{host.name} responded {response.status_code}")
+    raise UpstreamError(f"{method} {url} failed after {retries + 1} attempts: {error}")
+
+
+def stats() -> dict:
+    with _hosts_lock:
+        hosts = list(_hosts.values())
+    stats = {}
+    for host in hosts:
+        with host.lock:
+            stats[host.name] = {**host.stats.get(), "circuit": host.breaker.state}
+    return stats
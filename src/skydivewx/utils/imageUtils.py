@@ -0,0 +1,71 @@
+import hashlib
+import io
+
+from PIL import Image, ImageChops
+
+# Widths every capture is downscaled to, mobile and desktop at 1x and 2x
+VARIANT_WIDTHS = (550, 1100, 1600)
+# (format, mimetype, extension) tried in order of preference
+FORMATS = (
+    ("WEBP", "image/webp", "webp"),
+    ("JPEG", "image/jpeg", "jpg"),
+)
+QUALITY = 80
+# Pixels of background kept around the cropped content
+CROP_MARGIN = 8
+# How far a pixel may be from the background colour and still count as empty
+BACKGROUND_TOLERANCE = 16
+
+
+def crop_to_content(image: Image.Image) -> Image.Image:
+    """Crop away the uniform background around the page content, the empty
+    space Burble leaves around the load board"""
+    rgb = image.convert("RGB")
+    background = Image.new("RGB", rgb.size, rgb.getpixel((rgb.width - 1, rgb.height - 1)))
+    diff = ImageChops.difference(rgb, background).convert("L")
+    box = diff.point(lambda p: 255 if p > BACKGROUND_TOLERANCE else 0).getbbox()
+    if box is None:
+        return rgb
+    left, top, right, bottom = box
+    return rgb.crop(
+        (
+            max(0, left - CROP_MARGIN),
+            max(0, top - CROP_MARGIN),
+            min(rgb.width, right + CROP_MARGIN),
+            min(rgb.height, bottom + CROP_MARGIN),
+        )
+    )
+
+
+def downscale(image: Image.Image, width: int) -> Image.Image:
+    if image.width <= width:
+        return image
+    height = round(image.height * width / image.width)
+    return image.resize((width, height), Image.LANCZOS)
+
+
+def encode(image: Image.Image, format: str) -> bytes:
+    buffer = io.BytesIO()
+    image.save(buffer, format=format, quality=QUALITY, optimize=True)
+    return buffer.getvalue()
+
+
+def fingerprint(image: Image.Image) -> str:
+    # Hash of the decoded pixels, equal for identical boards however the
+    # PNG was encoded. A perceptual hash would miss a single changed name
+    return hashlib.sha1(image.tobytes()).hexdigest()[:16]
+
+
+def make_variants(
+    png: bytes, widths=VARIANT_WIDTHS
+) -> tuple[dict[tuple[int, str], bytes], str]:
+    """Crop a PNG screenshot and encode it at every width in `widths` (never
+    upscaled) in every format in FORMATS. Returns the variants, keyed by
+    (width, extension), and the fingerprint of the cropped image"""
+    image = crop_to_content(Image.open(io.BytesIO(png)))
+    variants = {}
+    for width in sorted(set(min(w, image.width) for w in widths)):
+        resized = downscale(image, width)
+        for format, _, extension in FORMATS:
+            variants[(width, extension)] = encode(resized, format)
+    return variants, fingerprint(image)
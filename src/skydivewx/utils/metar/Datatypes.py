@@ -5,6 +5,7 @@
 """
 import re
 from math import sin, cos, atan2, sqrt
+from operator import add, mul, sub, truediv
 
 # exceptions
 
@@ -23,10 +24,73 @@ FRACTION_RE = re.compile(r"^((?P<int>\d+)\s*)?(?P<num>\d)/(?P<den>\d+)$")
 # classes representing dimensioned values in METAR reports
 
 
-class temperature(object):
+def _conversions(units):
+    """Precompute the arithmetic steps between every pair of units, given
+    each unit as (multiply, divide, offset) from the base unit. Factors are
+    kept in whichever direction is exact and applied one step at a time, so
+    that 100 C is 212 F rather than 211.99999999999997."""
+    to_base = {}
+    from_base = {}
+    for name, (multiply, divide, offset) in units.items():
+        to_base[name] = [
+            (sub, offset),
+            (mul, divide),
+            (truediv, multiply),
+        ]
+        from_base[name] = [
+            (mul, multiply),
+            (truediv, divide),
+            (add, offset),
+        ]
+    conversions = {}
+    for a in units:
+        for b in units:
+            steps = [] if a == b else to_base[a] + from_base[b]
+            conversions[(a, b)] = tuple(
+                (op, operand)
+                for op, operand in steps
+                if operand != (0.0 if op in (add, sub) else 1.0)
+            )
+    return conversions
+
+
+class _convertible(object):
+    """Table-driven unit conversion shared by the dimensioned classes."""
+
+    __slots__ = ()
+
+    quantity = None
+    legal_units = []
+    # (from, to) -> ((operator, operand), ...)
+    conversions = {}
+
+    @classmethod
+    def convert(cls, value, from_units, to_units):
+        """Convert a value, or a NumPy array of values, between units."""
+        try:
+            steps = cls.conversions[(from_units.upper(), to_units.upper())]
+        except KeyError:
+            for units in (from_units, to_units):
+                if units.upper() not in cls.legal_units:
+                    raise UnitsError(
+                        "unrecognized " + cls.quantity + " unit: '" + units + "'"
+                    )
+            raise
+        for op, operand in steps:
+            value = op(value, operand)
+        return value
+
+
+class temperature(_convertible):
     """A class representing a temperature value."""
 
+    __slots__ = ("_units", "_value")
+
+    quantity = "temperature"
     legal_units = ["F", "C", "K"]
+    conversions = _conversions(
+        {"C": (1.0, 1.0, 0.0), "F": (1.8, 1.0, 32.0), "K": (1.0, 1.0, 273.15)}
+    )
 
     def __init__(self, value, units="C"):
         if not units.upper() in temperature.legal_units:
@@ -47,22 +111,7 @@ class temperature(object):
         """Return the temperature in the specified units."""
         if units is None:
             return self._value
-        else:
-            if not units.upper() in temperature.legal_units:
-                raise UnitsError("unrecognized temperature unit: '" + units + "'")
-            units = units.upper()
-        if self._units == "C":
-            celsius_value = self._value
-        elif self._units == "F":
-            celsius_value = (self._value - 32.0) / 1.8
-        elif self._units == "K":
-            celsius_value = self._value - 273.15
-        if units == "C":
-            return celsius_value
-        elif units == "K":
-            return 273.15 + celsius_value
-        elif units == "F":
-            return 32.0 + celsius_value * 1.8
+        return self.convert(self._value, self._units, units)
 
     def string(self, units=None):
         """Return a string representation of the temperature, using the given units."""
@@ -81,10 +130,16 @@ class temperature(object):
             return "%.1f K" % val
 
 
-class pressure(object):
+class pressure(_convertible):
     """A class representing a barometric pressure value."""
 
+    __slots__ = ("_units", "_value")
+
+    quantity = "pressure"
     legal_units = ["MB", "HPA", "IN"]
+    conversions = _conversions(
+        {"MB": (1.0, 1.0, 0.0), "HPA": (1.0, 1.0, 0.0), "IN": (1.0, 33.86398, 0.0)}
+    )
 
     def __init__(self, value, units="MB"):
         if not units.upper() in pressure.legal_units:
@@ -99,22 +154,7 @@ class pressure(object):
         """Return the pressure in the specified units."""
         if units is None:
             return self._value
-        else:
-            if not units.upper() in pressure.legal_units:
-                raise UnitsError("unrecognized pressure unit: '" + units + "'")
-            units = units.upper()
-        if units == self._units:
-            return self._value
-        if self._units == "IN":
-            mb_value = self._value * 33.86398
-        else:
-            mb_value = self._value
-        if units == "MB" or units == "HPA":
-            return mb_value
-        elif units == "IN":
-            return mb_value / 33.86398
-        else:
-            raise UnitsError("unrecognized pressure unit: '" + units + "'")
+        return self.convert(self._value, self._units, units)
 
     def string(self, units=None):
         """Return a string representation of the pressure, using the given units."""
@@ -133,10 +173,21 @@ class pressure(object):
             return "%.2f inches" % val
 
 
-class speed(object):
+class speed(_convertible):
     """A class representing a wind speed value."""
 
+    __slots__ = ("_units", "_gtlt", "_value")
+
+    quantity = "speed"
     legal_units = ["KT", "MPS", "KMH", "MPH"]
+    conversions = _conversions(
+        {
+            "MPS": (1.0, 1.0, 0.0),
+            "KT": (1.0, 0.514444, 0.0),
+            "KMH": (3.6, 1.0, 0.0),
+            "MPH": (1.0, 0.447, 0.0),
+        }
+    )
     legal_gtlt = [">", "<"]
 
     def __init__(self, value, units=None, gtlt=None):
@@ -160,28 +211,7 @@ class speed(object):
         """Return the speed in the specified units."""
         if not units:
             return self._value
-        else:
-            if not units.upper() in speed.legal_units:
-                raise UnitsError("unrecognized speed unit: '" + units + "'")
-            units = units.upper()
-        if units == self._units:
-            return self._value
-        if self._units == "KMH":
-            mps_value = self._value / 3.6
-        elif self._units == "KT":
-            mps_value = self._value * 0.514444
-        elif self._units == "MPH":
-            mps_value = self._value * 0.447000
-        else:
-            mps_value = self._value
-        if units == "KMH":
-            return mps_value * 3.6
-        elif units == "KT":
-            return mps_value / 0.514444
-        elif units == "MPH":
-            return mps_value / 0.447000
-        elif units == "MPS":
-            return mps_value
+        return self.convert(self._value, self._units, units)
 
     def string(self, units=None):
         """Return a string representation of the speed in the given units."""
@@ -207,10 +237,23 @@ class speed(object):
         return text
 
 
-class distance(object):
+class distance(_convertible):
     """A class representing a distance value."""
 
+    __slots__ = ("_units", "_gtlt", "_value", "_num", "_den")
+
+    quantity = "distance"
     legal_units = ["SM", "MI", "M", "KM", "FT", "IN"]
+    conversions = _conversions(
+        {
+            "SM": (1.0, 1609.344, 0.0),
+            "MI": (1.0, 1609.344, 0.0),
+            "M": (1.0, 1.0, 0.0),
+            "KM": (1.0, 1000.0, 0.0),
+            "FT": (3.28084, 1.0, 0.0),
+            "IN": (39.3701, 1.0, 0.0),
+        }
+    )
     legal_gtlt = [">", "<"]
 
     def __init__(self, value, units=None, gtlt=None):
@@ -257,32 +300,7 @@ class distance(object):
         """Return the distance in the specified units."""
         if not units:
             return self._value
-        else:
-            if not units.upper() in distance.legal_units:
-                raise UnitsError("unrecognized distance unit: '" + units + "'")
-            units = units.upper()
-        if units == self._units:
-            return self._value
-        if self._units == "SM" or self._units == "MI":
-            m_value = self._value * 1609.344
-        elif self._units == "FT":
-            m_value = self._value / 3.28084
-        elif self._units == "IN":
-            m_value = self._value / 39.3701
-        elif self._units == "KM":
-            m_value = self._value * 1000
-        else:
-            m_value = self._value
-        if units == "SM" or units == "MI":
-            return m_value / 1609.344
-        elif units == "FT":
-            return m_value * 3.28084
-        elif units == "IN":
-            return m_value * 39.3701
-        elif units == "KM":
-            return m_value / 1000
-        elif units == "M":
-            return m_value
+        return self.convert(self._value, self._units, units)
 
     def string(self, units=None):
         """Return a string representation of the distance in the given units."""
@@ -323,6 +341,8 @@ class distance(object):
 class direction(object):
     """A class representing a compass direction."""
 
+    __slots__ = ("_compass", "_degrees")
+
     compass_dirs = {
         "N": 0.0,
         "NNE": 22.5,
@@ -381,6 +401,8 @@ class direction(object):
 class precipitation(object):
     """A class representing a precipitation value."""
 
+    __slots__ = ("_units", "_gtlt", "_value", "_istrace")
+
     legal_units = ["IN", "CM"]
     legal_gtlt = [">", "<"]
 
@@ -462,6 +484,8 @@ class precipitation(object):
 class position(object):
     """A class representing a location on the earth's surface."""
 
+    __slots__ = ("latitude", "longitude")
+
     def __init__(self, latitude=None, longitude=None):
         self.latitude = latitude
         self.longitude = longitude
@@ -1,33 +1,48 @@
-from typing import Literal, Optional, Union
+from typing import Any, Callable, ClassVar, Literal, Optional, TypeVar, Union
 
 GreaterOrLess = Literal[">", "<"]
 Value = Union[str, float]
+# float or a NumPy array of floats
+Convertible = TypeVar("Convertible")
+Step = tuple[Callable[[Any, float], Any], float]
+Conversions = dict[tuple[str, str], tuple[Step, ...]]
 
 TemperatureUnit = Literal["F", "C", "K", "f", "c", "k"]
 
 class temperature:
+    conversions: ClassVar[Conversions]
     _units: TemperatureUnit
     _value: float
 
     def __init__(self, value: Value, units: TemperatureUnit = "C") -> None: ...
     def __str__(self) -> str: ...
     def value(self, units: Optional[TemperatureUnit] = None) -> float: ...
+    @classmethod
+    def convert(
+        cls, value: Convertible, from_units: TemperatureUnit, to_units: TemperatureUnit
+    ) -> Convertible: ...
     def string(self, units: Optional[TemperatureUnit] = None) -> str: ...
 
 PressureUnit = Literal["MB", "HPA", "IN", "mb", "hPa", "in"]
 
 class pressure:
+    conversions: ClassVar[Conversions]
     _units: PressureUnit
     _value: float
 
     def __init__(self, value: Value, units: PressureUnit = "MB") -> None: ...
     def __str__(self) -> str: ...
     def value(self, units: Optional[PressureUnit] = None) -> float: ...
+    @classmethod
+    def convert(
+        cls, value: Convertible, from_units: PressureUnit, to_units: PressureUnit
+    ) -> Convertible: ...
     def string(self, units: Optional[PressureUnit] = None) -> str: ...
 
 SpeedUnit = Literal["KT", "MPS", "KMH", "MPH", "kt", "mps", "kmh", "mph"]
 
 class speed:
+    conversions: ClassVar[Conversions]
     _units: SpeedUnit
     _value: float
     _gtlt: GreaterOrLess
@@ -40,6 +55,10 @@ class speed:
     ) -> None: ...
     def __str__(self) -> str: ...
     def value(self, units: Optional[SpeedUnit] = None) -> float: ...
+    @classmethod
+    def convert(
+        cls, value: Convertible, from_units: SpeedUnit, to_units: SpeedUnit
+    ) -> Convertible: ...
     def string(self, units: Optional[SpeedUnit] = None) -> str: ...
 
 DistanceUnit = Literal[
@@ -47,6 +66,7 @@ DistanceUnit = Literal[
 ]
 
 class distance:
+    conversions: ClassVar[Conversions]
     _units: DistanceUnit
     _value: float
     _gtlt: GreaterOrLess
@@ -61,6 +81,10 @@ class distance:
     ) -> None: ...
     def __str__(self) -> str: ...
     def value(self, units: Optional[DistanceUnit] = None) -> float: ...
+    @classmethod
+    def convert(
+        cls, value: Convertible, from_units: DistanceUnit, to_units: DistanceUnit
+    ) -> Convertible: ...
     def string(self, units: Optional[DistanceUnit] = None) -> str: ...
 
 CompassDirection = Literal[
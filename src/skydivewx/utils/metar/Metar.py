@@ -7,8 +7,13 @@ A Metar object represents the weather report encoded by a single METAR code.
 """
 import re
 import datetime
+import threading
 import warnings
 import logging
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import NamedTuple
 
 from utils.metar import __version__, __author__, __email__, __LICENSE__
 from utils.metar.Datatypes import (
@@ -31,21 +36,24 @@ class ParserError(Exception):
     pass
 
 
-# regular expressions to decode various groups of the METAR code
+# regular expressions to decode various groups of the METAR code. These are
+# applied with pattern.match(code, pos), which anchors them at pos, so they
+# must not start with "^" (that would only ever match at the start of the
+# report)
 MISSING_RE = re.compile(r"^[M/]+$")
 
-TYPE_RE = re.compile(r"^(?P<type>METAR|SPECI)\s+")
-COR_RE = re.compile(r"^(?P<cor>COR)\s+")
-STATION_RE = re.compile(r"^(?P<station>[A-Z][A-Z0-9]{3})\s+")
+TYPE_RE = re.compile(r"(?P<type>METAR|SPECI)\s+")
+COR_RE = re.compile(r"(?P<cor>COR)\s+")
+STATION_RE = re.compile(r"(?P<station>[A-Z][A-Z0-9]{3})\s+")
 TIME_RE = re.compile(
-    r"""^(?P<day>\d\d)
+    r"""(?P<day>\d\d)
         (?P<hour>\d\d)
         (?P<min>\d\d)Z?\s+""",
     re.VERBOSE,
 )
-MODIFIER_RE = re.compile(r"^(?P<mod>AUTO|COR AUTO|FINO|NIL|TEST|CORR?|RTD|CC[A-G])\s+")
+MODIFIER_RE = re.compile(r"(?P<mod>AUTO|COR AUTO|FINO|NIL|TEST|CORR?|RTD|CC[A-G])\s+")
 WIND_RE = re.compile(
-    r"""^(?P<dir>[\dO]{3}|[0O]|///|MMM|VRB)
+    r"""(?P<dir>[\dO]{3}|[0O]|///|MMM|VRB)
         (?P<speed>P?[\dO]{2,3}|[/M]{2,3})
         (G(?P<gust>P?(\d{1,3}|[/M]{1,3})))?
         (?P<units>KTS?|LT|K|T|KMH|MPS)?
@@ -54,7 +62,7 @@ WIND_RE = re.compile(
     re.VERBOSE,
 )
 VISIBILITY_RE = re.compile(
-    r"""^(?P<vis>(?P<dist>(M|P)?\d\d\d\d|////)
+    r"""(?P<vis>(?P<dist>(M|P)?\d\d\d\d|////)
         (?P<dir>[NSEW][EW]? | NDV)? |
         (?P<distu>(M|P)?(\d+|\d\d?/\d\d?|\d+\s+\d/\d))
         (?P<units>SM|KM|M|U) |
@@ -62,7 +70,7 @@ VISIBILITY_RE = re.compile(
     re.VERBOSE,
 )
 RUNWAY_RE = re.compile(
-    r"""^(RVRNO |
+    r"""(RVRNO |
         R(?P<name>\d\d(RR?|LL?|C)?)/
         (?P<low>(M|P)?(\d\d\d\d|/{4}))
         (V(?P<high>(M|P)?\d\d\d\d))?
@@ -70,7 +78,7 @@ RUNWAY_RE = re.compile(
     re.VERBOSE,
 )
 WEATHER_RE = re.compile(
-    r"""^(?P<int>(-|\+|VC)*)
+    r"""(?P<int>(-|\+|VC)*)
         (?P<desc>(MI|PR|BC|DR|BL|SH|TS|FZ)+)?
         (?P<prec>(DZ|RA|SN|SG|IC|PL|GR|GS|UP|/)*)
         (?P<obsc>BR|FG|FU|VA|DU|SA|HZ|PY)?
@@ -79,32 +87,32 @@ WEATHER_RE = re.compile(
     re.VERBOSE,
 )
 SKY_RE = re.compile(
-    r"""^(?P<cover>VV|CLR|SKC|SCK|NSC|NCD|BKN|SCT|FEW|[O0]VC|///)
+    r"""(?P<cover>VV|CLR|SKC|SCK|NSC|NCD|BKN|SCT|FEW|[O0]VC|///)
         (?P<height>[\dO]{2,4}|///)?
         (?P<cloud>([A-Z][A-Z]+|///))?\s+""",
     re.VERBOSE,
 )
 TEMP_RE = re.compile(
-    r"""^(?P<temp>(M|-)?\d{1,2}|//|XX|MM)/
+    r"""(?P<temp>(M|-)?\d{1,2}|//|XX|MM)/
         (?P<dewpt>(M|-)?\d{1,2}|//|XX|MM)?\s+""",
     re.VERBOSE,
 )
 PRESS_RE = re.compile(
-    r"""^(?P<unit>A|Q|QNH)?
+    r"""(?P<unit>A|Q|QNH)?
         (?P<press>[\dO]{3,4}|////)
         (?P<unit2>INS)?\s+""",
     re.VERBOSE,
 )
 RECENT_RE = re.compile(
-    r"""^RE(?P<desc>MI|PR|BC|DR|BL|SH|TS|FZ)?
+    r"""RE(?P<desc>MI|PR|BC|DR|BL|SH|TS|FZ)?
         (?P<prec>(DZ|RA|SN|SG|IC|PL|GR|GS|UP)*)?
         (?P<obsc>BR|FG|FU|VA|DU|SA|HZ|PY)?
         (?P<other>PO|SQ|FC|SS|DS)?\s+""",
     re.VERBOSE,
 )
-WINDSHEAR_RE = re.compile(r"^(WS\s+)?(ALL\s+RWY|R(WY)?(?P<name>\d\d(RR?|L?|C)?))\s+")
+WINDSHEAR_RE = re.compile(r"(WS\s+)?(ALL\s+RWY|R(WY)?(?P<name>\d\d(RR?|L?|C)?))\s+")
 COLOR_RE = re.compile(
-    r"""^(BLACK)?(BLU|GRN|WHT|RED)\+?
+    r"""(BLACK)?(BLU|GRN|WHT|RED)\+?
                         (/?(BLACK)?(BLU|GRN|WHT|RED)\+?)*\s*""",
     re.VERBOSE,
 )
@@ -118,17 +126,17 @@ RUNWAYSTATE_RE = re.compile(
         (?P<friction>(\d\d|//))))\s+""",
     re.VERBOSE,
 )
-TREND_RE = re.compile(r"^(?P<trend>TEMPO|BECMG|FCST|NOSIG)\s+")
+TREND_RE = re.compile(r"(?P<trend>TEMPO|BECMG|FCST|NOSIG)\s+")
 
 TRENDTIME_RE = re.compile(r"(?P<when>(FM|TL|AT))(?P<hour>\d\d)(?P<min>\d\d)\s+")
 
-REMARK_RE = re.compile(r"^(RMKS?|NOSPECI|NOSIG)\s+")
+REMARK_RE = re.compile(r"(RMKS?|NOSPECI|NOSIG)\s+")
 
 # regular expressions for remark groups
-AUTO_RE = re.compile(r"^AO(?P<type>\d)\s+")
-SEALVL_PRESS_RE = re.compile(r"^SLP(?P<press>\d\d\d)\s+")
+AUTO_RE = re.compile(r"AO(?P<type>\d)\s+")
+SEALVL_PRESS_RE = re.compile(r"SLP(?P<press>\d\d\d)\s+")
 PEAK_WIND_RE = re.compile(
-    r"""^P[A-Z]\s+WND\s+
+    r"""P[A-Z]\s+WND\s+
         (?P<dir>\d\d\d)
         (?P<speed>P?\d\d\d?)/
         (?P<hour>\d\d)?
@@ -136,38 +144,38 @@ PEAK_WIND_RE = re.compile(
     re.VERBOSE,
 )
 WIND_SHIFT_RE = re.compile(
-    r"""^WSHFT\s+
+    r"""WSHFT\s+
         (?P<hour>\d\d)?
         (?P<min>\d\d)
         (\s+(?P<front>FROPA))?\s+""",
     re.VERBOSE,
 )
-PRECIP_1HR_RE = re.compile(r"^P(?P<precip>\d\d\d\d)\s+")
+PRECIP_1HR_RE = re.compile(r"P(?P<precip>\d\d\d\d)\s+")
 PRECIP_24HR_RE = re.compile(
-    r"""^(?P<type>6|7)
+    r"""(?P<type>6|7)
         (?P<precip>\d\d\d\d)\s+""",
     re.VERBOSE,
 )
 PRESS_3HR_RE = re.compile(
-    r"""^5(?P<tend>[0-8])
+    r"""5(?P<tend>[0-8])
 (?P<press>\d\d\d)\s+""",
     re.VERBOSE,
 )
 TEMP_1HR_RE = re.compile(
-    r"""^T(?P<tsign>0|1)
+    r"""T(?P<tsign>0|1)
         (?P<temp>\d\d\d)
         ((?P<dsign>0|1)
         (?P<dewpt>\d\d\d))?\s+""",
     re.VERBOSE,
 )
 TEMP_6HR_RE = re.compile(
-    r"""^(?P<type>1|2)
+    r"""(?P<type>1|2)
         (?P<sign>0|1)
         (?P<temp>\d\d\d)\s+""",
     re.VERBOSE,
 )
 TEMP_24HR_RE = re.compile(
-    r"""^4(?P<smaxt>0|1)
+    r"""4(?P<smaxt>0|1)
         (?P<maxt>\d\d\d)
         (?P<smint>0|1)
         (?P<mint>\d\d\d)\s+""",
@@ -176,7 +184,7 @@ TEMP_24HR_RE = re.compile(
 UNPARSED_RE = re.compile(r"(?P<group>\S+)\s+")
 
 LIGHTNING_RE = re.compile(
-    r"""^((?P<freq>OCNL|FRQ|CONS)\s+)?
+    r"""((?P<freq>OCNL|FRQ|CONS)\s+)?
         LTG(?P<type>(IC|CC|CG|CA)*)
         ( \s+(?P<loc>( OHD | VC | DSNT\s+ | \s+AND\s+ |
         [NSEW][EW]? (-[NSEW][EW]?)* )+) )?\s+""",
@@ -189,11 +197,15 @@ TS_LOC_RE = re.compile(
         ( \s+MOV\s+(?P<dir>[NSEW][EW]?) )?\s+""",
     re.VERBOSE,
 )
-SNOWDEPTH_RE = re.compile(r"""^4/(?P<snowdepth>\d\d\d)\s+""")
+SNOWDEPTH_RE = re.compile(r"""4/(?P<snowdepth>\d\d\d)\s+""")
 ICE_ACCRETION_RE = re.compile(
-    r"^I(?P<ice_accretion_hours>[136])(?P<ice_accretion_depth>\d\d\d)\s+"
+    r"I(?P<ice_accretion_hours>[136])(?P<ice_accretion_depth>\d\d\d)\s+"
 )
 
+# used by lazy decoding to pick the temperature group out of undecoded remarks
+REMARKS_START_RE = re.compile(r"(?:^|(?<=\s))RMKS?\s+")
+TEMP_1HR_SEARCH_RE = re.compile(r"(?<=\s)T[01]\d\d\d([01]\d\d\d)?\s")
+
 
 # translation of weather location codes
 loc_terms = [("OHD", "overhead"), ("DSNT", "distant"), ("AND", "and"), ("VC", "nearby")]
@@ -351,7 +363,82 @@ debug = False
 class Metar(object):
     """METAR (aviation meteorology report)"""
 
-    def __init__(self, metarcode, month=None, year=None, utcdelta=None, strict=True):
+    # No per-instance __dict__, parsed reports are kept around by the
+    # thousand in station histories
+    __slots__ = (
+        "code",
+        "type",
+        "correction",
+        "mod",
+        "station_id",
+        "time",
+        "cycle",
+        "wind_dir",
+        "wind_speed",
+        "wind_gust",
+        "wind_dir_from",
+        "wind_dir_to",
+        "vis",
+        "vis_dir",
+        "max_vis",
+        "max_vis_dir",
+        "temp",
+        "dewpt",
+        "press",
+        "runway",
+        "weather",
+        "recent",
+        "sky",
+        "windshear",
+        "wind_speed_peak",
+        "wind_dir_peak",
+        "peak_wind_time",
+        "wind_shift_time",
+        "max_temp_6hr",
+        "min_temp_6hr",
+        "max_temp_24hr",
+        "min_temp_24hr",
+        "press_sea_level",
+        "precip_1hr",
+        "precip_3hr",
+        "precip_6hr",
+        "precip_24hr",
+        "snowdepth",
+        "ice_accretion_1hr",
+        "ice_accretion_3hr",
+        "ice_accretion_6hr",
+        "_trend",
+        "_trend_groups",
+        "_remarks",
+        "_unparsed_groups",
+        "_unparsed_remarks",
+        "_now",
+        "_utcdelta",
+        "_month",
+        "_year",
+        "_day",
+        "_hour",
+        "_min",
+    )
+
+    # Whether the trend and remarks sections are left for later, see LazyMetar
+    _defer_tail = False
+
+    def __new__(cls, *args, lazy=False, **kwargs):
+        if lazy and cls is Metar:
+            cls = LazyMetar
+        return super().__new__(cls)
+
+    def __init__(
+        self,
+        metarcode,
+        month=None,
+        year=None,
+        utcdelta=None,
+        strict=True,
+        now=None,
+        lazy=False,
+    ):
         """
         Parse raw METAR code.
 
@@ -368,6 +455,14 @@ class Metar(object):
           unparsable groups are found or an unexpected exception is encountered.
           Setting this to `False` will prevent exceptions from being raised and
           only generate warning messages.
+        now : datetime.datetime, optional
+          Current UTC time (naive) used to guess the month and year. Defaults
+          to the time the object is created; ``parse_many`` passes one
+          snapshot to every report of a batch.
+        lazy : bool (default is False)
+          Only decode the main body of the report now and leave the trend
+          and remarks sections until one of their attributes is first read.
+          The object is then a ``LazyMetar``.
         """
 
         self.code = metarcode  # original METAR code
@@ -394,6 +489,29 @@ class Metar(object):
         self.recent = []  # recent weather (list of tuples)
         self.sky = []  # sky conditions (list of tuples)
         self.windshear = []  # runways w/ wind shear (list of strings)
+        self._trend = False  # trend groups present (bool)
+        self._unparsed_groups = []
+        if not self._defer_tail:
+            self._init_tail()
+
+        if now is None:
+            now = datetime.datetime.now(datetime.timezone.utc).replace(tzinfo=None)
+        self._now = now
+        if utcdelta:
+            self._utcdelta = utcdelta
+        else:
+            self._utcdelta = datetime.datetime.now() - self._now
+
+        self._month = month
+        self._year = year
+
+        # Do some string prep before parsing. The report is never sliced,
+        # pos is where the next group starts
+        self._decode(_sanitize(self.code), 0, 0, -1, strict, self._defer_tail)
+        self._check_unparsed(metarcode, strict)
+
+    def _init_tail(self):
+        # Attributes only the trend and remarks sections set
         self.wind_speed_peak = None  # peak wind speed in last hour
         self.wind_dir_peak = None  # direction of peak wind speed in last hour
         self.peak_wind_time = None  # time of peak wind observation [datetime]
@@ -411,78 +529,95 @@ class Metar(object):
         self.ice_accretion_1hr = None  # ice accretion over the past hour
         self.ice_accretion_3hr = None  # ice accretion over the past 3 hours
         self.ice_accretion_6hr = None  # ice accretion over the past 6 hours
-        self._trend = False  # trend groups present (bool)
         self._trend_groups = []  # trend forecast groups
         self._remarks = []  # remarks (list of strings)
-        self._unparsed_groups = []
         self._unparsed_remarks = []
 
-        self._now = datetime.datetime.now(datetime.timezone.utc).replace(tzinfo=None)
-        if utcdelta:
-            self._utcdelta = utcdelta
-        else:
-            self._utcdelta = datetime.datetime.now() - self._now
-
-        self._month = month
-        self._year = year
+    def _check_unparsed(self, metarcode, strict, start=0):
+        if self._unparsed_groups[start:]:
+            code = " ".join(self._unparsed_groups[start:])
+            message = "Unparsed groups in body '%s' while processing '%s'" % (
+                code,
+                metarcode,
+            )
+            if strict:
+                raise ParserError(message)
+            else:
+                warnings.warn(message, RuntimeWarning)
 
-        # Do some string prep before parsing
-        code = _sanitize(self.code)
+    def _decode(self, code, pos, igroup, ifailed, strict, defer=False):
+        """
+        Run the group handlers over `code` from `pos`, starting with the
+        main-body handler at index `igroup`. With `defer`, stop where the
+        trend and remarks sections begin and hand them to ``_defer``.
+        """
+        end = len(code)
+        pattern = handler = None
         try:
             ngroup = len(self.handlers)
-            igroup = 0
-            ifailed = -1
-            while igroup < ngroup and code:
+            while igroup < ngroup and pos < end:
                 pattern, handler, repeatable = self.handlers[igroup]
+                if (
+                    defer
+                    and pattern is TREND_RE
+                    and (TREND_RE.match(code, pos) or REMARK_RE.match(code, pos))
+                    and self.time is not None
+                    and not self._unparsed_groups
+                ):
+                    # Only the trend and remarks sections are left. Reports
+                    # with a broken body are decoded in full, remark handlers
+                    # can stop early on them and skip the temperature group
+                    self._defer(code, pos, igroup, ifailed)
+                    return
                 if debug:
-                    _logger.debug("%s: %s", handler.__name__, code)
-                m = pattern.match(code)
+                    _logger.debug("%s: %s", handler.__name__, code[pos:])
+                m = pattern.match(code, pos)
                 while m:
                     ifailed = -1
                     if debug:
                         _report_match(handler, m.group())
                     handler(self, m.groupdict())
-                    code = code[m.end() :]
+                    pos = m.end()
                     if self._trend:
-                        code = self._do_trend_handlers(code)
+                        pos = self._do_trend_handlers(code, pos)
                     if not repeatable:
                         break
 
                     if debug:
-                        _logger.debug("%s: %s", handler.__name__, code)
-                    m = pattern.match(code)
+                        _logger.debug("%s: %s", handler.__name__, code[pos:])
+                    m = pattern.match(code, pos)
                 if not m and ifailed < 0:
                     ifailed = igroup
                 igroup += 1
                 if igroup == ngroup and not m:
                     pattern, handler = (UNPARSED_RE, _unparsedGroup)
                     if debug:
-                        _logger.debug("%s: %s", handler.__name__, code)
-                    m = pattern.match(code)
+                        _logger.debug("%s: %s", handler.__name__, code[pos:])
+                    m = pattern.match(code, pos)
                     if debug:
                         _report_match(handler, m.group())
                     handler(self, m.groupdict())
-                    code = code[m.end() :]
+                    pos = m.end()
                     igroup = ifailed
                     ifailed = -2  # if it's still -2 when we run out of main-body
                     #  groups, we'll try parsing this group as a remark
             if pattern == REMARK_RE or self.press:
-                while code:
+                while pos < end:
                     for pattern, handler in self.remark_handlers:
                         if debug:
-                            _logger.debug("%s: %s", handler.__name__, code)
-                        m = pattern.match(code)
+                            _logger.debug("%s: %s", handler.__name__, code[pos:])
+                        m = pattern.match(code, pos)
                         if m:
                             if debug:
                                 _report_match(handler, m.group())
                             handler(self, m.groupdict())
-                            code = pattern.sub("", code, 1)
+                            pos = m.end()
                             break
 
         except Exception as err:
             message = ("%s failed while processing '%s'\n\t%s") % (
                 handler.__name__,
-                code,
+                code[pos:],
                 "\n\t".join(err.args),
             )
             if strict:
@@ -490,17 +625,6 @@ class Metar(object):
             else:
                 warnings.warn(message, RuntimeWarning)
 
-        if self._unparsed_groups:
-            code = " ".join(self._unparsed_groups)
-            message = "Unparsed groups in body '%s' while processing '%s'" % (
-                code,
-                metarcode,
-            )
-            if strict:
-                raise ParserError(message)
-            else:
-                warnings.warn(message, RuntimeWarning)
-
     @property
     def decode_completed(self):
         """
@@ -508,21 +632,23 @@ class Metar(object):
         """
         return not self._unparsed_groups
 
-    def _do_trend_handlers(self, code):
+    def _do_trend_handlers(self, code, pos=0):
+        """Match the trend groups of `code` starting at `pos`, returns the
+        position after the last one matched."""
         for pattern, handler, repeatable in self.trend_handlers:
             if debug:
-                print(handler.__name__, ":", code)
-            m = pattern.match(code)
+                print(handler.__name__, ":", code[pos:])
+            m = pattern.match(code, pos)
             while m:
                 if debug:
                     _report_match(handler, m.group())
                 self._trend_groups.append(m.group().strip())
                 handler(self, m.groupdict())
-                code = code[m.end() :]
+                pos = m.end()
                 if not repeatable:
                     break
-                m = pattern.match(code)
-        return code
+                m = pattern.match(code, pos)
+        return pos
 
     def __str__(self):
         return self.string()
@@ -1373,3 +1499,248 @@ class Metar(object):
         Return the decoded remarks.
         """
         return sep.join(self._remarks)
+
+
+class LazyMetar(Metar):
+    """
+    METAR whose trend and remarks sections are decoded on first use.
+
+    Created with ``Metar(code, lazy=True)``. The main body is decoded
+    straight away, along with the hourly temperature group of the remarks
+    since it refines ``temp`` and ``dewpt``. The attributes only the trend
+    and remarks sections set are left unset until one of them is first
+    read, which decodes the rest of the report. Problems found there are
+    reported as warnings, never raised. Until then the private ``_trend``
+    and ``_unparsed_groups`` only cover the main body. Reports whose main
+    body does not decode cleanly are decoded in full straight away.
+    """
+
+    __slots__ = ("_tail",)
+
+    _defer_tail = True
+
+    def __init__(self, *args, **kwargs):
+        # () while nothing is deferred, None once the tail is decoded
+        self._tail = ()
+        super().__init__(*args, **kwargs)
+
+    def __getattr__(self, name):
+        # Only called for slots that have not been set yet
+        if name in _TAIL_ATTRIBUTES and self._tail is not None:
+            self._decode_tail()
+            return getattr(self, name)
+        raise AttributeError(
+            "'%s' object has no attribute '%s'" % (type(self).__name__, name)
+        )
+
+    def _defer(self, code, pos, igroup, ifailed):
+        self._tail = (code, pos, igroup, ifailed)
+        remarks = REMARKS_START_RE.search(code, pos)
+        m = remarks and TEMP_1HR_SEARCH_RE.search(code, remarks.end())
+        if m:
+            self._handleTemp1hrRemark(TEMP_1HR_RE.match(code, m.start()).groupdict())
+
+    def _decode_tail(self):
+        with _tail_lock:
+            tail = self._tail
+            if tail is None:
+                return
+            # Decoded on a copy and published once complete, instances may
+            # be shared between threads
+            scratch = object.__new__(Metar)
+            scratch._init_tail()
+            for name in Metar.__slots__:
+                try:
+                    value = object.__getattribute__(self, name)
+                except AttributeError:
+                    continue
+                object.__setattr__(
+                    scratch, name, list(value) if isinstance(value, list) else value
+                )
+            if tail:
+                code, pos, igroup, ifailed = tail
+                start = len(scratch._unparsed_groups)
+                scratch._decode(code, pos, igroup, ifailed, strict=False)
+                scratch._check_unparsed(self.code, False, start)
+            for name in Metar.__slots__:
+                try:
+                    value = object.__getattribute__(scratch, name)
+                except AttributeError:
+                    continue
+                object.__setattr__(self, name, value)
+            object.__setattr__(self, "_tail", None)
+
+    def __getstate__(self):
+        # Pickled fully decoded. Built by hand, object.__getstate__ is new in
+        # Python 3.11
+        self._decode_tail()
+        slots = {}
+        for name in Metar.__slots__ + LazyMetar.__slots__:
+            try:
+                slots[name] = object.__getattribute__(self, name)
+            except AttributeError:
+                continue
+        return None, slots
+
+    @property
+    def decode_completed(self):
+        self._decode_tail()
+        return super().decode_completed
+
+
+# Serialises decoding of deferred sections, which is rare and quick
+_tail_lock = threading.Lock()
+
+
+class _ReadOnly:
+    """Rejects attribute writes, see ``freeze``."""
+
+    __slots__ = ()
+
+    def __setattr__(self, name, value):
+        raise AttributeError("'%s' object is read-only" % (type(self).__name__,))
+
+    def __delattr__(self, name):
+        raise AttributeError("'%s' object is read-only" % (type(self).__name__,))
+
+    def __setstate__(self, state):
+        _, slots = state
+        for name, value in slots.items():
+            object.__setattr__(self, name, value)
+
+
+class FrozenMetar(_ReadOnly, Metar):
+    __slots__ = ()
+
+
+class FrozenLazyMetar(_ReadOnly, LazyMetar):
+    __slots__ = ()
+
+
+def freeze(metar):
+    """
+    Make `metar` read-only so it can be shared between callers and threads.
+
+    Lazy reports stay lazy, their deferred sections are still decoded on
+    first use.
+    """
+    if isinstance(metar, _ReadOnly):
+        return metar
+    metar.__class__ = FrozenLazyMetar if isinstance(metar, LazyMetar) else FrozenMetar
+    return metar
+
+
+_TAIL_ATTRIBUTES = frozenset(
+    (
+        "wind_speed_peak",
+        "wind_dir_peak",
+        "peak_wind_time",
+        "wind_shift_time",
+        "max_temp_6hr",
+        "min_temp_6hr",
+        "max_temp_24hr",
+        "min_temp_24hr",
+        "press_sea_level",
+        "precip_1hr",
+        "precip_3hr",
+        "precip_6hr",
+        "precip_24hr",
+        "snowdepth",
+        "ice_accretion_1hr",
+        "ice_accretion_3hr",
+        "ice_accretion_6hr",
+        "_trend_groups",
+        "_remarks",
+        "_unparsed_remarks",
+    )
+)
+
+
+class ParseResult(NamedTuple):
+    """Outcome of parsing one report with ``parse_many``."""
+
+    code: str
+    metar: "Metar | None"
+    error: "Exception | None"
+
+
+def _parse_batch(codes, month, year, utcdelta, strict, now, lazy):
+    results = []
+    for code in codes:
+        try:
+            metar = Metar(code, month, year, utcdelta, strict, now, lazy=lazy)
+        except Exception as err:
+            results.append(ParseResult(code, None, err))
+        else:
+            results.append(ParseResult(code, metar, None))
+    return results
+
+
+def _batches(codes, size):
+    codes = iter(codes)
+    while True:
+        batch = list(islice(codes, size))
+        if not batch:
+            return
+        yield batch
+
+
+def parse_many(
+    metarcodes,
+    workers=None,
+    month=None,
+    year=None,
+    utcdelta=None,
+    strict=True,
+    now=None,
+    chunksize=256,
+    lazy=False,
+):
+    """
+    Parse many raw METAR codes, e.g. the lines of an hourly cycle file.
+
+    Yields a ``ParseResult`` per code, in input order. A report that fails
+    to parse yields a result holding the exception instead of raising it.
+
+    Parameters
+    ----------
+    metarcodes : iterable of str
+      Consumed lazily, so arbitrarily long streams can be parsed.
+    workers : int, optional
+      Number of worker processes. Reports are parsed in this process when
+      it is not given or below 2.
+    month, year, utcdelta, strict :
+      As for ``Metar``, applied to every report.
+    now : datetime.datetime, optional
+      Current UTC time (naive) shared by every report, taken once when the
+      batch starts if not given.
+    chunksize : int
+      Reports sent to a worker process at a time.
+    lazy : bool
+      As for ``Metar``. Lazy reports parsed in worker processes come back
+      fully decoded, so this mostly pays off without workers.
+    """
+    if now is None:
+        now = datetime.datetime.now(datetime.timezone.utc).replace(tzinfo=None)
+    if utcdelta is None:
+        # Same local offset Metar works out for itself, computed once
+        utcdelta = datetime.datetime.now() - now
+    if not workers or workers < 2:
+        for batch in _batches(metarcodes, chunksize):
+            yield from _parse_batch(batch, month, year, utcdelta, strict, now, lazy)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        # A couple of batches in flight per worker keeps every process busy
+        # without reading the whole input ahead of the consumer
+        pending = deque()
+        for batch in _batches(metarcodes, chunksize):
+            pending.append(
+                executor.submit(
+                    _parse_batch, batch, month, year, utcdelta, strict, now, lazy
+                )
+            )
+            if len(pending) >= 2 * workers:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
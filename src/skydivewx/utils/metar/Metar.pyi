@@ -1,6 +1,17 @@
 from datetime import datetime, timedelta
 from re import Match
-from typing import Callable, List, Literal, Optional, Tuple, Union
+from typing import (
+    Any,
+    Callable,
+    Iterable,
+    Iterator,
+    List,
+    Literal,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Union,
+)
 
 from utils.metar.Datatypes import (
     direction,
@@ -76,10 +87,17 @@ class Metar:
         year: Optional[int] = ...,
         utcdelta: Union[int, timedelta, None] = ...,
         strict: bool = ...,
+        now: Optional[datetime] = ...,
+        lazy: bool = ...,
     ): ...
     @property
     def decode_completed(self) -> bool: ...
-    def _do_trend_handlers(self, code: str) -> str: ...
+    def _init_tail(self) -> None: ...
+    def _check_unparsed(self, metarcode: str, strict: bool, start: int = ...) -> None: ...
+    def _decode(
+        self, code: str, pos: int, igroup: int, ifailed: int, strict: bool, defer: bool = ...
+    ) -> None: ...
+    def _do_trend_handlers(self, code: str, pos: int = ...) -> int: ...
     def __str__(self) -> str: ...
     def _handleType(self, d: dict) -> None: ...
     def _handleCorrection(self, d: dict) -> None: ...
@@ -150,3 +168,35 @@ class Metar:
     def sky_conditions(self, sep: str = "; ") -> str: ...
     def trend(self) -> str: ...
     def remarks(self, sep: str = "; ") -> str: ...
+
+class LazyMetar(Metar):
+    def __getattr__(self, name: str) -> Any: ...
+    def _defer(self, code: str, pos: int, igroup: int, ifailed: int) -> None: ...
+    def _decode_tail(self) -> None: ...
+
+class _ReadOnly:
+    def __setattr__(self, name: str, value: Any) -> None: ...
+    def __delattr__(self, name: str) -> None: ...
+    def __setstate__(self, state: tuple) -> None: ...
+
+class FrozenMetar(_ReadOnly, Metar): ...
+class FrozenLazyMetar(_ReadOnly, LazyMetar): ...
+
+def freeze(metar: Metar) -> Metar: ...
+
+class ParseResult(NamedTuple):
+    code: str
+    metar: Optional[Metar]
+    error: Optional[Exception]
+
+def parse_many(
+    metarcodes: Iterable[str],
+    workers: Optional[int] = ...,
+    month: Optional[int] = ...,
+    year: Optional[int] = ...,
+    utcdelta: Union[int, timedelta, None] = ...,
+    strict: bool = ...,
+    now: Optional[datetime] = ...,
+    chunksize: int = ...,
+    lazy: bool = ...,
+) -> Iterator[ParseResult]: ...
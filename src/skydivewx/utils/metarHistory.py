@@ -0,0 +1,195 @@
+import re
+import threading
+import time
+from collections import deque
+from datetime import datetime, timedelta
+from typing import Callable, Iterable, NamedTuple
+
+import numpy as np
+
+from utils.metar import Metar
+
+OBSERVATION_TIME_RE = re.compile(r"\b(?P<day>\d\d)(?P<hour>\d\d)(?P<min>\d\d)Z\b")
+
+# Upper bound on reports held per station, hourly METARs plus a generous
+# number of SPECIs
+MAX_REPORTS_PER_HOUR = 12
+
+
+def _observation_time(raw: str, now: datetime) -> datetime | None:
+    # Cheap look at the DDHHMMZ group so old reports never get parsed
+    match = OBSERVATION_TIME_RE.search(raw)
+    if not match:
+        return None
+    day, hour, minute = (int(match.group(k)) for k in ("day", "hour", "min"))
+    month, year = now.month, now.year
+    if day > now.day:
+        # Report is from last month
+        month, year = (12, year - 1) if month == 1 else (month - 1, year)
+    try:
+        return datetime(year, month, day, hour, minute)
+    except ValueError:
+        return None
+
+
+def _measure(value, *units) -> float:
+    return np.nan if value is None else value.value(*units)
+
+
+class MetarColumns(NamedTuple):
+    """A station's reports as read-only columns, oldest first, in canonical
+    units. Missing values are NaN"""
+
+    time: np.ndarray  # observation time, UTC [datetime64[s]]
+    wind_speed: np.ndarray  # knots
+    wind_gust: np.ndarray  # knots
+    wind_dir: np.ndarray  # degrees
+    visibility: np.ndarray  # metres
+    temp: np.ndarray  # C
+    dewpt: np.ndarray  # C
+    altimeter: np.ndarray  # hPa
+
+    @classmethod
+    def from_reports(
+        cls, reports: Iterable[tuple[datetime, Metar.Metar]]
+    ) -> "MetarColumns":
+        reports = list(reports)
+        metars = [metar for _, metar in reports]
+        columns = cls(
+            np.array([observed for observed, _ in reports], dtype="datetime64[s]"),
+            np.array([_measure(m.wind_speed, "KT") for m in metars], dtype=float),
+            np.array([_measure(m.wind_gust, "KT") for m in metars], dtype=float),
+            np.array([_measure(m.wind_dir) for m in metars], dtype=float),
+            np.array([_measure(m.vis, "M") for m in metars], dtype=float),
+            np.array([_measure(m.temp, "C") for m in metars], dtype=float),
+            np.array([_measure(m.dewpt, "C") for m in metars], dtype=float),
+            np.array([_measure(m.press, "MB") for m in metars], dtype=float),
+        )
+        for column in columns:
+            column.flags.writeable = False
+        return columns
+
+    @property
+    def size(self) -> int:
+        return len(self.time)
+
+    def since(self, cutoff: datetime) -> "MetarColumns":
+        """Reports observed at or after `cutoff` (UTC), as views"""
+        start = np.searchsorted(self.time, np.datetime64(cutoff, "s"))
+        return MetarColumns(*(column[start:] for column in self))
+
+
+class StationHistory:
+    """Append-only ring buffer of parsed reports for one station, ordered
+    oldest to newest by observation time"""
+
+    def __init__(self, hours: int) -> None:
+        self.hours = hours
+        self.reports: deque[tuple[datetime, Metar.Metar]] = deque(
+            maxlen=hours * MAX_REPORTS_PER_HOUR
+        )
+        # Rebuilt whenever reports change and shared with every reader, who
+        # must never iterate `reports` while another thread extends it
+        self.columns = MetarColumns.from_reports(())
+        self.refreshed_at = 0.0
+        self.lock = threading.Lock()
+
+    @property
+    def latest(self) -> datetime | None:
+        return self.reports[-1][0] if self.reports else None
+
+    def extend(
+        self,
+        raw_reports: list[str],
+        now: datetime,
+        parse: Callable[..., Iterable[Metar.ParseResult]] = Metar.parse_many,
+    ) -> int:
+        # raw_reports come newest first from upstream, only parse the ones
+        # newer than what is already stored
+        latest = self.latest
+        new_reports = []
+        for raw in raw_reports:
+            observed = _observation_time(raw, now)
+            if observed is None:
+                continue
+            if latest is not None and observed <= latest:
+                break
+            new_reports.append((observed, raw))
+        new_reports.reverse()
+        results = parse([raw for _, raw in new_reports], now=now)
+        for (observed, raw), result in zip(new_reports, results):
+            if result.error is not None:
+                print(f"Skipping unparseable METAR '{raw}': {result.error}")
+                continue
+            self.reports.append((observed, result.metar))
+        cutoff = now - timedelta(hours=self.hours)
+        while self.reports and self.reports[0][0] < cutoff:
+            self.reports.popleft()
+        self.columns = MetarColumns.from_reports(self.reports)
+        return len(new_reports)
+
+
+class MetarHistory:
+    """Per-station history of METAR reports that is refreshed incrementally.
+
+    The first refresh of a station downloads the full window, every refresh
+    after that only asks upstream for the last hour and parses reports newer
+    than the last one stored."""
+
+    def __init__(
+        self,
+        fetch: Callable[[str, int], list[str] | None],
+        hours: int = 4,
+        refresh_after: Callable[[], float] = lambda: 300,
+        parse: Callable[..., Iterable[Metar.ParseResult]] = Metar.parse_many,
+    ) -> None:
+        self.fetch = fetch
+        self.hours = hours
+        self.refresh_after = refresh_after
+        # Turns a batch of raw reports into ParseResults, in order
+        self.parse = parse
+        self._stations: dict[str, StationHistory] = {}
+        self._lock = threading.Lock()
+
+    def _station(self, airportIdentifier: str) -> StationHistory:
+        with self._lock:
+            station = self._stations.get(airportIdentifier)
+            if station is None:
+                station = StationHistory(self.hours)
+                self._stations[airportIdentifier] = station
+            return station
+
+    def refresh(
+        self, airportIdentifier: str, now: datetime = None, max_age: float = 0
+    ) -> int:
+        now = now or datetime.utcnow()
+        station = self._station(airportIdentifier)
+        with station.lock:
+            if time.monotonic() - station.refreshed_at < max_age:
+                # Another caller refreshed while we waited on the lock
+                return 0
+            latest = station.latest
+            if latest is None or now - latest >= timedelta(hours=1):
+                hours = self.hours
+            else:
+                hours = 1
+            raw_reports = self.fetch(airportIdentifier, hours)
+            if raw_reports is None:
+                return 0
+            added = station.extend(raw_reports, now, self.parse)
+            station.refreshed_at = time.monotonic()
+            return added
+
+    def _fresh_station(self, airportIdentifier: str) -> StationHistory:
+        station = self._station(airportIdentifier)
+        max_age = self.refresh_after()
+        if time.monotonic() - station.refreshed_at >= max_age:
+            self.refresh(airportIdentifier, max_age=max_age)
+        return station
+
+    def columns(self, airportIdentifier: str, hours: int = None) -> MetarColumns:
+        """Reports from the last `hours` hours as columns, oldest first"""
+        columns = self._fresh_station(airportIdentifier).columns
+        if hours is not None and hours < self.hours:
+            columns = columns.since(datetime.utcnow() - timedelta(hours=hours))
+        return columns
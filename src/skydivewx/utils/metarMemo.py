@@ -0,0 +1,102 @@
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Callable, Iterable
+
+from utils.metar import Metar
+
+
+class MetarMemo:
+    """Bounded LRU of parsed METAR reports keyed by their sanitized text.
+
+    The same report is asked for by every render, every client and every
+    history refresh until the next one is issued, so it is parsed once and
+    the read-only result shared. Entries expire `ttl()` seconds after they
+    are parsed."""
+
+    def __init__(
+        self,
+        maxsize: int = 1024,
+        ttl: Callable[[], float] = lambda: 600,
+        prepare: Callable[[Metar.Metar], Metar.Metar] = lambda metar: metar,
+    ) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        # Applied to every report once it is parsed, before it is frozen
+        self.prepare = prepare
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, tuple[float, Metar.Metar]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _get(self, key: str) -> Metar.Metar | None:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= now:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def _set(self, key: str, metar: Metar.Metar) -> None:
+        expires = time.monotonic() + self.ttl()
+        with self._lock:
+            self._entries[key] = (expires, metar)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def parse_many(
+        self, raw_reports: Iterable[str], now: datetime = None
+    ) -> list[Metar.ParseResult]:
+        """Lazily parse every report not already in the memo, in one batch.
+        Results come back in the order of `raw_reports`"""
+        raw_reports = list(raw_reports)
+        keys = [Metar._sanitize(raw) for raw in raw_reports]
+        results: dict[str, Metar.ParseResult] = {}
+        missing: dict[str, str] = {}
+        for raw, key in zip(raw_reports, keys):
+            if key in results or key in missing:
+                continue
+            metar = self._get(key)
+            if metar is None:
+                missing[key] = raw
+            else:
+                results[key] = Metar.ParseResult(raw, metar, None)
+        parsed = Metar.parse_many(missing.values(), now=now, lazy=True)
+        for key, result in zip(missing, parsed):
+            if result.error is None:
+                try:
+                    metar = Metar.freeze(self.prepare(result.metar))
+                except Exception as e:
+                    result = result._replace(metar=None, error=e)
+                else:
+                    self._set(key, metar)
+                    result = result._replace(metar=metar)
+            results[key] = result
+        return [
+            results[key]._replace(code=raw) for raw, key in zip(raw_reports, keys)
+        ]
+
+    def parse(self, raw: str) -> Metar.Metar:
+        """Shared read-only parse of a single report, raises what parsing it
+        raised"""
+        result = self.parse_many([raw])[0]
+        if result.error is not None:
+            raise result.error
+        return result.metar
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._entries),
+            }
@@ -0,0 +1,48 @@
+from utils import scheduler, weatherUtils
+from utils.dropzones.dropzones import Dropzones
+
+# How often every supported station is fetched upstream, in seconds
+POLL_INTERVAL = 2 * 60
+
+
+def get_station_identifiers() -> list[str]:
+    # Every unique METAR station used by a supported dropzone
+    identifiers = []
+    for dropZone in Dropzones:
+        identifier = dropZone.airportIdentifier.metarAirportIdentifier
+        if identifier and identifier not in identifiers:
+            identifiers.append(identifier)
+    return identifiers
+
+
+def poll_once() -> int:
+    """Fetch the latest METAR for every station in a single request and
+    publish the parsed reports for page callbacks to read. Returns the number
+    of stations published"""
+    reports = weatherUtils._get_raw_metars(
+        get_station_identifiers(), max_age=POLL_INTERVAL
+    )
+    # Keep reports around for a couple of cycles so one failed poll does
+    # not push every client back to fetching on its own
+    ttl = POLL_INTERVAL * 2 + weatherUtils.METAR_MIN_TTL
+    published = 0
+    results = weatherUtils.metar_memo.parse_many(reports.values())
+    for identifier, result in zip(reports, results):
+        if result.error is not None:
+            print(f"Could not parse METAR for {identifier}: {result.error}")
+            continue
+        weatherUtils.publish_metar(identifier, result.metar, ttl=ttl)
+        published += 1
+    return published
+
+
+job: scheduler.Job | None = None
+
+
+def register() -> scheduler.Job:
+    """Schedule `poll_once` every POLL_INTERVAL seconds, call before
+    scheduler.start. Registers the job only once"""
+    global job
+    if job is None:
+        job = scheduler.Job("metar", POLL_INTERVAL, poll_once)
+    return job
@@ -0,0 +1,209 @@
+import os
+import threading
+import time
+from typing import Any, Callable, Hashable, NamedTuple
+
+# Stop refreshing a key when no callback has asked for it in this long
+IDLE_AFTER = 15 * 60
+# Snapshots that missed this many refresh intervals are served marked stale
+STALE_AFTER_INTERVALS = 3
+
+_sources: list["DataSource"] = []
+_jobs: list["Job"] = []
+_started_pid: int = None
+_start_lock = threading.Lock()
+
+
+class Snapshot(NamedTuple):
+    value: Any
+    fetched_at: float
+    stale: bool = False
+
+    @property
+    def age(self) -> float:
+        return time.time() - self.fetched_at
+
+
+class Job:
+    """A function run in the background every `interval` seconds"""
+
+    def __init__(self, name: str, interval: float, run: Callable[[], Any]) -> None:
+        self.name = name
+        self.interval = interval
+        self.run = run
+        _jobs.append(self)
+
+    def loop(self, stop: threading.Event) -> None:
+        while not stop.is_set():
+            started = time.monotonic()
+            try:
+                self.run()
+            except Exception as e:
+                print(f"{self.name} job failed: {e}")
+            stop.wait(max(0, self.interval - (time.monotonic() - started)))
+
+
+class DataSource:
+    """Upstream data refreshed in the background on its own cadence.
+
+    Callbacks call `read(key)` which returns the latest snapshot for that key
+    without touching the upstream. Keys are refreshed every `interval` seconds
+    for as long as somebody keeps reading them. Only a key that has never been
+    fetched (cold start) is fetched inline, and only once: should that fail,
+    reads return None and leave the retries to the background refresh until
+    `retry_after` seconds (by default one interval) have passed. A snapshot
+    that is far overdue, e.g. while the upstream is down, is still served but
+    marked stale and a refresh is kicked off in the background."""
+
+    def __init__(
+        self,
+        name: str,
+        fetch: Callable[[Hashable], Any],
+        interval: float,
+        idle_after: float = IDLE_AFTER,
+        retry_after: float = None,
+    ) -> None:
+        self.name = name
+        self.fetch = fetch
+        self.interval = interval
+        self.idle_after = idle_after
+        self.retry_after = interval if retry_after is None else retry_after
+        self._snapshots: dict[Hashable, Snapshot] = {}
+        # When the last fetch of a key failed, monotonic seconds
+        self._failed: dict[Hashable, float] = {}
+        self._last_read: dict[Hashable, float] = {}
+        self._refreshed: dict[Hashable, float] = {}
+        self._refreshing: set[Hashable] = set()
+        self._in_flight: dict[Hashable, threading.Event] = {}
+        self._lock = threading.Lock()
+        _sources.append(self)
+
+    def snapshot(self, key: Hashable) -> Snapshot | None:
+        with self._lock:
+            self._last_read[key] = time.monotonic()
+            snapshot = self._snapshots.get(key)
+            failed_at = self._failed.get(key)
+        if snapshot is None:
+            if (
+                failed_at is not None
+                and time.monotonic() - failed_at < self.retry_after
+            ):
+                # Failed recently, do not hold up another request on it
+                return None
+            return self.refresh(key)
+        if snapshot.age > self.interval * STALE_AFTER_INTERVALS:
+            # The scheduler is either not running in this process yet or the
+            # upstream has been failing, serve what we have
+            self.refresh_in_background(key)
+            return snapshot._replace(stale=True)
+        return snapshot
+
+    def read(self, key: Hashable) -> Any:
+        snapshot = self.snapshot(key)
+        return snapshot.value if snapshot else None
+
+    def refresh(self, key: Hashable) -> Snapshot | None:
+        """Fetch `key` now. Only one fetch per key is in flight at a time,
+        concurrent callers wait for it and share its result."""
+        with self._lock:
+            in_flight = self._in_flight.get(key)
+            if in_flight is None:
+                in_flight = self._in_flight[key] = threading.Event()
+                self._refreshed[key] = time.monotonic()
+                leader = True
+            else:
+                leader = False
+        if not leader:
+            in_flight.wait()
+            with self._lock:
+                return self._snapshots.get(key)
+        try:
+            value = self.fetch(key)
+        except Exception as e:
+            print(f"Refreshing {self.name} for {key} failed: {e}")
+            value = None
+        with self._lock:
+            if value is not None:
+                self._snapshots[key] = Snapshot(value, time.time())
+                self._failed.pop(key, None)
+            else:
+                self._failed[key] = time.monotonic()
+            del self._in_flight[key]
+            in_flight.set()
+            return self._snapshots.get(key) if value is not None else None
+
+    def refresh_in_background(self, key: Hashable) -> None:
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+
+        def _refresh():
+            try:
+                self.refresh(key)
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        threading.Thread(target=_refresh, daemon=True).start()
+
+    def due(self) -> list[Hashable]:
+        now = time.monotonic()
+        with self._lock:
+            for key in [
+                k for k, t in self._last_read.items() if now - t > self.idle_after
+            ]:
+                del self._last_read[key]
+                self._snapshots.pop(key, None)
+                self._refreshed.pop(key, None)
+                self._failed.pop(key, None)
+            return [
+                key
+                for key in self._last_read
+                if now - self._refreshed.get(key, 0) >= self.interval
+            ]
+
+    def loop(self, stop: threading.Event) -> None:
+        while not stop.is_set():
+            for key in self.due():
+                if stop.is_set():
+                    break
+                self.refresh(key)
+            stop.wait(1)
+
+
+_stop = threading.Event()
+
+
+def _start_threads() -> None:
+    global _started_pid, _stop
+    with _start_lock:
+        # Threads do not survive a fork, so start once in every worker process
+        if _started_pid == os.getpid():
+            return
+        _started_pid = os.getpid()
+        _stop = threading.Event()
+        for task in [*_jobs, *_sources]:
+            threading.Thread(
+                target=task.loop,
+                args=(_stop,),
+                name=f"scheduler-{task.name}",
+                daemon=True,
+            ).start()
+
+
+def start(server) -> None:
+    """Run every registered job and data source in the background of each
+    process serving requests for the given Flask `server`"""
+
+    @server.before_request
+    def _ensure_scheduler_started():
+        if _started_pid != os.getpid():
+            _start_threads()
+
+
+def stop() -> None:
+    global _started_pid
+    with _start_lock:
+        _stop.set()
+        _started_pid = None
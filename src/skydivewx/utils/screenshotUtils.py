@@ -1,39 +1,145 @@
 import base64
+import threading
 import time
+from contextlib import contextmanager
+from typing import Iterator
 
-from selenium import webdriver
 from selenium.common.exceptions import TimeoutException
-from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 
+from utils.browserPool import BrowserPoolTimeout, browser_pool
 
-def getBurbleScreenshot(burbleUrl: str):
-    chrome_options = Options()
-    chrome_options.add_argument("--headless")
-    chrome_options.add_argument("--window-size=1920,1080")
+# Longest a capture gets to navigate to the page and for it to become ready,
+# in seconds
+CAPTURE_DEADLINE = 20
+# The page counts as ready once neither the DOM nor the network has changed
+# for this long, in milliseconds
+QUIET_PERIOD_MS = 300
+
+# Resolves once the DOM and network have been quiet for QUIET_PERIOD_MS, or
+# with idle false when the deadline passes first
+WAIT_FOR_IDLE_SCRIPT = """
+var quietMs = arguments[0], deadlineMs = arguments[1];
+var done = arguments[arguments.length - 1];
+var started = performance.now(), lastMutation = performance.now();
+var observer = new MutationObserver(function () {
+    lastMutation = performance.now();
+});
+observer.observe(document.documentElement, {
+    childList: true, subtree: true, attributes: true, characterData: true
+});
+var timer = setInterval(function () {
+    var now = performance.now();
+    var lastNetwork = window.__lastNetworkActivity || 0;
+    var idle = !window.__pendingRequests
+        && now - lastMutation >= quietMs
+        && now - lastNetwork >= quietMs;
+    if (idle || now - started >= deadlineMs) {
+        clearInterval(timer);
+        observer.disconnect();
+        done(idle);
+    }
+}, 50);
+"""
+
+
+class CaptureStats:
+    """Time spent in each phase of a capture, in seconds"""
+
+    PHASES = ("acquire", "navigate", "ready", "capture", "encode", "variants")
+
+    def __init__(self) -> None:
+        self.phases = {
+            phase: {"count": 0, "total": 0.0, "max": 0.0, "last": 0.0}
+            for phase in CaptureStats.PHASES
+        }
+        self.not_idle = 0
+        self._lock = threading.Lock()
+
+    def record(self, phase: str, seconds: float) -> None:
+        with self._lock:
+            stats = self.phases.setdefault(
+                phase, {"count": 0, "total": 0.0, "max": 0.0, "last": 0.0}
+            )
+            stats["count"] += 1
+            stats["total"] += seconds
+            stats["max"] = max(stats["max"], seconds)
+            stats["last"] = seconds
+
+    def missed_idle(self) -> None:
+        with self._lock:
+            self.not_idle += 1
 
-    img_data = []
+    @contextmanager
+    def timed(self, phase: str) -> Iterator[None]:
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            self.record(phase, time.monotonic() - started)
 
-    driver = webdriver.Chrome(options=chrome_options)
-    driver.get(url=burbleUrl)
+    def get(self) -> dict:
+        with self._lock:
+            return {
+                "not_idle": self.not_idle,
+                **{
+                    phase: {
+                        **stats,
+                        "avg": stats["total"] / stats["count"] if stats["count"] else 0,
+                    }
+                    for phase, stats in self.phases.items()
+                },
+            }
+
+
+capture_stats = CaptureStats()
+
+
+def _waitUntilReady(driver, deadline: float) -> None:
+    # Burble's own loading cues first, then wait for the board to settle.
+    # Raises TimeoutException if the cues do not show up before the deadline
+    WebDriverWait(driver, max(0, deadline - time.monotonic())).until(
+        EC.invisibility_of_element_located((By.CLASS_NAME, "x-mask-msg"))
+    )
+    WebDriverWait(driver, max(0, deadline - time.monotonic())).until(
+        EC.visibility_of_element_located((By.CLASS_NAME, "x-toolbar"))
+    )
+    remaining = max(0, deadline - time.monotonic())
+    driver.set_script_timeout(remaining + 1)
+    idle = driver.execute_async_script(
+        WAIT_FOR_IDLE_SCRIPT, QUIET_PERIOD_MS, remaining * 1000
+    )
+    if not idle:
+        # Still changing at the deadline, capture what is there
+        capture_stats.missed_idle()
+
+
+def getBurbleScreenshot(burbleUrl: str):
+    # Borrows a warm browser from the pool, so a capture costs a page
+    # navigation instead of a browser start
+    started = time.monotonic()
     try:
-        WebDriverWait(driver, 10).until(
-            EC.invisibility_of_element_located((By.CLASS_NAME, "x-mask-msg"))
-        )
-        WebDriverWait(driver, 10).until(
-            EC.visibility_of_element_located((By.CLASS_NAME, "x-toolbar"))
-        )
-        # TODO find a better way to wait for the page components to load
-        # maybe EC.visibility_of_element_located or something
-        time.sleep(1)
-        screenshot = driver.get_screenshot_as_png()
-        img_data.append(base64.b64encode(screenshot).decode())
-    except TimeoutException as e:
-        # Could not load in manifest
+        with browser_pool.checkout() as driver:
+            capture_stats.record("acquire", time.monotonic() - started)
+            deadline = time.monotonic() + CAPTURE_DEADLINE
+            try:
+                with capture_stats.timed("navigate"):
+                    # A hung page would otherwise hold the browser for
+                    # Selenium's default of five minutes
+                    driver.set_page_load_timeout(CAPTURE_DEADLINE)
+                    driver.get(url=burbleUrl)
+                with capture_stats.timed("ready"):
+                    _waitUntilReady(driver, deadline)
+            except TimeoutException as e:
+                # Could not load in manifest
+                return ""
+            with capture_stats.timed("capture"):
+                screenshot = driver.get_screenshot_as_png()
+    except BrowserPoolTimeout as e:
+        print(f"Skipping manifest capture of {burbleUrl}: {e}")
         return ""
-    finally:
-        driver.quit()
 
-    return img_data[0]
+    with capture_stats.timed("encode"):
+        return base64.b64encode(screenshot).decode()
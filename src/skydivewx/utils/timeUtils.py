@@ -1,12 +1,13 @@
 from datetime import datetime
 
+import numpy as np
 import pytz
-import requests
 from pytz import timezone
+from utils import httpUtils
 
 
 def get_current_date_yyyymmdd():
-    response = requests.get(
+    response = httpUtils.get(
         "https://timeapi.io/api/Time/current/zone?timeZone=America/Boise"
     )
     json_response = response.json()
@@ -49,6 +50,20 @@ def convert_utc_to_mst(time):
     return dt.astimezone(mst_tz)
 
 
+def convert_utc_to_mst_array(times: np.ndarray) -> np.ndarray:
+    # Naive local times for an array of UTC datetime64 values
+    def offset(time):
+        return np.timedelta64(convert_utc_to_mst(time.astype(datetime)).utcoffset())
+
+    if not len(times):
+        return times
+    first, last = offset(times[0]), offset(times[-1])
+    if first == last:
+        return times + first
+    # Spans a daylight saving change
+    return np.array([time + offset(time) for time in times])
+
+
 def time_diff(time):
     metar_time = convert_utc_to_mst(time)
     now_time = convert_utc_to_mst(datetime.utcnow())
@@ -56,9 +71,16 @@ def time_diff(time):
 
     # Get the difference in days, hours, minutes, seconds
     seconds = diff.seconds
+    hours = diff.days * 24 + seconds // 3600
     minutes = (seconds % 3600) // 60
 
-    return f"{minutes} minutes ago"
+    def plural(count, unit):
+        return f"{count} {unit}" if count == 1 else f"{count} {unit}s"
+
+    # Reports can be served stale while upstream is down, so show hours too
+    if hours > 0:
+        return f"{plural(hours, 'hour')} {plural(minutes, 'minute')} ago"
+    return f"{plural(minutes, 'minute')} ago"
 
 
 def get_time_now_mst():
@@ -1,24 +1,80 @@
-from typing import Union
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+from typing import NamedTuple, Union
 from utils.metar import Metar
-import requests
+from utils import httpUtils, scheduler
+from utils.cacheUtils import MAX_STALE, TTLCache, shared_cache
+from utils.metarHistory import MetarColumns, MetarHistory
+from utils.metarMemo import MetarMemo
+import json
+import re
+import threading
+import time
+
+# Routine METARs are issued once an hour just before the top of the hour
+# (usually HH:51-HH:56Z) and show up upstream a couple minutes later. SPECI
+# reports can be issued at any time, so never hold on to a report for longer
+# than METAR_MAX_TTL seconds.
+METAR_ISSUE_MINUTE = 58
+METAR_MAX_TTL = 10 * 60
+METAR_MIN_TTL = 30
+
+# How long an expired METAR may still be served while upstream is degraded
+METAR_STALE_TTL = 2 * 60 * 60
+# Raw reports on disk younger than this are used instead of fetching, which
+# lets a freshly (re)started worker serve warm data
+METAR_DISK_MAX_AGE = 5 * 60
+
+# Latest report per airportIdentifier, shared by every callback and client
+# in this process
+metar_cache = TTLCache(ttl=METAR_MAX_TTL, stale_ttl=METAR_STALE_TTL)
 
 
 def _get_raw_metar(airport_code, hours=0):
     # Returns parsed json or list of parsed json
     url = f"https://aviationweather.gov/cgi-bin/data/metar.php?ids={airport_code}&hours={hours}"
-    retries = 0
-    while retries < 5:
-        try:
-            response = requests.get(url).text.split("\n")
-            if hours > 0:
-                response.pop()
-            else:
-                response = response[0]
-            return response
-        except Exception as e:
-            print(f"{e}... retrying {retries}")
-            retries += 1
-    return None
+    try:
+        response = shared_cache.fetch(
+            f"metar:{airport_code}:{hours}",
+            lambda: httpUtils.get(url).text,
+            max_age=METAR_DISK_MAX_AGE,
+        ).split("\n")
+    except httpUtils.UpstreamError as e:
+        print(e)
+        return None
+    if hours > 0:
+        response.pop()
+    else:
+        response = response[0]
+    return response
+
+
+def _get_raw_metars(airport_codes: list[str], max_age: float = 0) -> dict[str, str]:
+    # One request for the latest METAR of every station in airport_codes,
+    # shared with any other worker that polled within max_age seconds
+    ids = ",".join(airport_codes)
+    url = f"https://aviationweather.gov/cgi-bin/data/metar.php?ids={ids}&hours=0"
+    response = shared_cache.fetch(
+        f"metars:{ids}",
+        lambda: httpUtils.get(url).text,
+        max_age=max_age,
+        max_stale=0,
+    ).split("\n")
+    reports = {}
+    for line in response:
+        groups = line.split()
+        if groups and groups[0] in ("METAR", "SPECI"):
+            groups = groups[1:]
+        if groups and groups[0] in airport_codes:
+            # Newest report comes first, keep that one
+            reports.setdefault(groups[0], line)
+    for airport_code, line in reports.items():
+        shared_cache.set(f"metar:{airport_code}:0", line)
+    return reports
+
+
+def publish_metar(airportIdentifier: str, metar: Metar.Metar, ttl: float) -> None:
+    metar_cache.set(airportIdentifier, metar, ttl=ttl)
 
 
 def _ensure_values(metar: Metar.Metar) -> Metar.Metar:
@@ -30,19 +86,59 @@ def _ensure_values(metar: Metar.Metar) -> Metar.Metar:
     return metar
 
 
-def get_metar(airportIdentifier: str, hours=0) -> Metar.Metar | None:
+def _metar_ttl(now: datetime = None) -> float:
+    # Seconds until the next routine METAR is expected upstream
+    now = now or datetime.now(timezone.utc)
+    seconds_into_hour = now.minute * 60 + now.second
+    issued_at = METAR_ISSUE_MINUTE * 60
+    until_next_issue = (issued_at - seconds_into_hour) % 3600
+    return max(METAR_MIN_TTL, min(METAR_MAX_TTL, until_next_issue))
+
+
+# Parsed reports shared by the poller, the history and page callbacks, each
+# report text is parsed once until the next one is issued
+metar_memo = MetarMemo(ttl=_metar_ttl, prepare=_ensure_values)
+
+
+# Window of reports kept per station for the wind trend chart
+METAR_HISTORY_HOURS = 4
+# Background refresh cadence of each data source, in seconds
+METAR_HISTORY_REFRESH_INTERVAL = 5 * 60
+FORECAST_REFRESH_INTERVAL = 10 * 60
+
+
+def get_metar_columns(
+    airportIdentifier: str, hours=METAR_HISTORY_HOURS
+) -> MetarColumns | None:
+    # Reports from the last `hours` hours as columns, oldest first
+    columns = metar_columns_source.read(airportIdentifier)
+    if columns is not None and hours < METAR_HISTORY_HOURS:
+        return columns.since(datetime.utcnow() - timedelta(hours=hours))
+    return columns
+
+
+def get_metar(airportIdentifier: str) -> Metar.Metar | None:
+    cached = metar_cache.get_entry(airportIdentifier)
+    if cached is not None:
+        if cached.stale:
+            # Serve the last good report right away, fetch a new one behind it
+            metar_cache.refresh_in_background(
+                airportIdentifier, lambda: _fetch_metar(airportIdentifier), _metar_ttl
+            )
+        return cached.value
+    result = _fetch_metar(airportIdentifier)
+    if result is not None:
+        metar_cache.set(airportIdentifier, result, ttl=_metar_ttl())
+    return result
+
+
+def _fetch_metar(airportIdentifier: str) -> Metar.Metar | None:
     try:
-        metar = _get_raw_metar(airportIdentifier, hours=hours)
-        if not metar:
+        raw = _get_raw_metar(airportIdentifier)
+        if not raw:
             print("No metar found, returning None")
             return None
-        if hours == 0:
-            return _ensure_values(Metar.Metar(metar))
-        else:
-            return [
-                _ensure_values(Metar.Metar(metar))
-                for metar in _get_raw_metar(airportIdentifier, hours=hours)
-            ]
+        return metar_memo.parse(raw)
     except IndexError as e:
         print(
             "error: Airport identifier may not have a valid METAR, check surrounding areas for valid metar"
@@ -50,27 +146,155 @@ def get_metar(airportIdentifier: str, hours=0) -> Metar.Metar | None:
         raise e
 
 
+metar_history = MetarHistory(
+    fetch=_get_raw_metar,
+    hours=METAR_HISTORY_HOURS,
+    refresh_after=_metar_ttl,
+    parse=metar_memo.parse_many,
+)
+metar_columns_source = scheduler.DataSource(
+    "metar-columns",
+    metar_history.columns,
+    interval=METAR_HISTORY_REFRESH_INTERVAL,
+)
+
+
+class ForecastEntry(NamedTuple):
+    periods: tuple
+    etag: str | None
+    last_modified: str | None
+    expires: float
+    # When upstream last sent or confirmed these periods
+    fetched_at: float
+
+    @property
+    def age(self) -> float:
+        return time.time() - self.fetched_at
+
+
+# Parsed hourly forecast per weatherGovGridpointLocation along with the
+# validators api.weather.gov sent with it
+forecast_cache: dict[str, ForecastEntry] = {}
+_forecast_cache_lock = threading.Lock()
+
+
+def _expires_at(headers) -> float:
+    # Epoch seconds until which a response may be reused without revalidating
+    max_age = re.search(r"max-age=(\d+)", headers.get("Cache-Control", ""))
+    if max_age:
+        return time.time() + int(max_age.group(1))
+    try:
+        return parsedate_to_datetime(headers["Expires"]).timestamp()
+    except (KeyError, TypeError, ValueError):
+        return 0
+
+
+def _load_forecast_entry(gridpointLocation: str) -> ForecastEntry | None:
+    # Forecast a previous process stored on disk
+    entry = shared_cache.get(f"forecast:{gridpointLocation}")
+    if not entry:
+        return None
+    try:
+        periods = tuple(json.loads(entry.payload))
+    except ValueError:
+        return None
+    return ForecastEntry(
+        periods, entry.etag, entry.last_modified, entry.expires, entry.fetched_at
+    )
+
+
+def _store_forecast_entry(gridpointLocation: str, entry: ForecastEntry) -> None:
+    with _forecast_cache_lock:
+        forecast_cache[gridpointLocation] = entry
+    shared_cache.set(
+        f"forecast:{gridpointLocation}",
+        json.dumps(entry.periods),
+        etag=entry.etag,
+        last_modified=entry.last_modified,
+        expires=entry.expires,
+        fetched_at=entry.fetched_at,
+    )
+
+
+def _freshest_forecast_entry(gridpointLocation: str) -> ForecastEntry | None:
+    # This process' copy, unless another process stored a newer one
+    with _forecast_cache_lock:
+        cached = forecast_cache.get(gridpointLocation)
+    if cached is None or time.time() >= cached.expires:
+        shared = _load_forecast_entry(gridpointLocation)
+        if shared and (cached is None or shared.expires > cached.expires):
+            with _forecast_cache_lock:
+                forecast_cache[gridpointLocation] = shared
+            cached = shared
+    return cached
+
+
 def _fetch_hourly_forecast_data(gridpointLocation: str):
-    retries = 0
-    while retries < 5:
+    cached = _freshest_forecast_entry(gridpointLocation)
+    if cached and time.time() < cached.expires:
+        return cached.periods
+    with shared_cache.lock(f"forecast:{gridpointLocation}"):
+        # Another worker may have revalidated it while we waited
+        cached = _freshest_forecast_entry(gridpointLocation)
+        if cached and time.time() < cached.expires:
+            return cached.periods
+        return _revalidate_forecast(gridpointLocation, cached)
+
+
+def _revalidate_forecast(gridpointLocation: str, cached: ForecastEntry | None):
+    headers = {}
+    if cached and cached.etag:
+        headers["If-None-Match"] = cached.etag
+    if cached and cached.last_modified:
+        headers["If-Modified-Since"] = cached.last_modified
+
+    url = f"https://api.weather.gov/gridpoints/{gridpointLocation}/forecast/hourly"
+    for attempt in range(httpUtils.MAX_RETRIES + 1):
         try:
-            response = requests.get(
-                f"https://api.weather.gov/gridpoints/{gridpointLocation}/forecast/hourly"
-            )
-            json_response = response.json()
-            return json_response.get("properties").get("periods")
-        except AttributeError as e:
+            response = httpUtils.get(url, headers=headers)
+            if response.status_code == 304 and cached:
+                # Unchanged upstream, keep the periods that were parsed before
+                entry = cached._replace(
+                    expires=_expires_at(response.headers), fetched_at=time.time()
+                )
+            else:
+                json_response = response.json()
+                entry = ForecastEntry(
+                    tuple(json_response.get("properties").get("periods")),
+                    response.headers.get("ETag"),
+                    response.headers.get("Last-Modified"),
+                    _expires_at(response.headers),
+                    time.time(),
+                )
+            _store_forecast_entry(gridpointLocation, entry)
+            return entry.periods
+        except AttributeError:
             # For some reason sometimes this errors out, so try again
-            retries += 1
-            pass
-    # If you're here its fucked
+            time.sleep(httpUtils.backoff_delay(attempt))
+        except (httpUtils.UpstreamError, ValueError) as e:
+            print(e)
+            break
+    # If you're here its fucked, fall back to whatever was stored as long as
+    # it is not too old to be any use, like every other disk-backed fetch
+    if cached and cached.age < MAX_STALE:
+        return cached.periods
     return None
 
 
+def _fetch_forecast_snapshot(gridpointLocation: str) -> tuple | None:
+    periods = _fetch_hourly_forecast_data(gridpointLocation)
+    return tuple(periods) if periods else None
+
+
+forecast_source = scheduler.DataSource(
+    "forecast", _fetch_forecast_snapshot, interval=FORECAST_REFRESH_INTERVAL
+)
+
+
 def get_forecast(hours: int, gridpointLocation: str) -> Union[list, None]:
     try:
-        data = _fetch_hourly_forecast_data(gridpointLocation)
-        return data[:hours]
+        data = forecast_source.read(gridpointLocation)
+        return list(data[:hours])
     except Exception:
         return None
 
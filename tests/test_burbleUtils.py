@@ -0,0 +1,57 @@
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src", "skydivewx"))
+
+from utils import burbleUtils  # noqa: E402
+
+# burble_manifest.json is hand-written in the shape parse_manifest reads and
+# has not been checked against a live board, which is why the table view is
+# behind SKYDIVEWX_MANIFEST_DATA. Overwrite it with a redacted response from
+# BURBLE_MANIFEST_DATA_URL before turning that on by default
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures")
+
+
+def _fixture(name):
+    with open(os.path.join(FIXTURES, name)) as f:
+        return json.load(f)
+
+
+def test_parse_manifest_board():
+    loads = burbleUtils.parse_manifest(_fixture("burble_manifest.json"))
+    assert loads == [
+        burbleUtils.ManifestLoad("Load 7", "Caravan N208SU", 12, 4, "Manifesting"),
+        burbleUtils.ManifestLoad("Load 8", "Caravan N208SU", 37, 15, "Manifesting"),
+        burbleUtils.ManifestLoad("Load 9", "Twin Otter", None, 19, "On Hold"),
+    ]
+
+
+def test_parse_manifest_never_shows_database_ids():
+    loads = burbleUtils.parse_manifest({"loads": [{"id": 918276, "name": "Load 1"}]})
+    assert [load.number for load in loads] == ["Load 1"]
+
+
+def test_parse_manifest_empty_board():
+    assert burbleUtils.parse_manifest({"loads": []}) == []
+
+
+@pytest.mark.parametrize(
+    "payload",
+    [
+        {"loads": [{"id": 918273, "aircraft_id": 4, "seats": 15}]},
+        {"error": "Invalid dropzone"},
+        "<html></html>",
+    ],
+)
+def test_parse_manifest_rejects_other_formats(payload):
+    with pytest.raises(burbleUtils.ManifestFormatError):
+        burbleUtils.parse_manifest(payload)
+
+
+def test_get_dz_id():
+    url = "https://dzm.burblesoft.com/jmp?dz_id=408&columns=5&display_menu=0"
+    assert burbleUtils.get_dz_id(url) == "408"
+    assert burbleUtils.get_dz_id("https://dzm.burblesoft.com/jmp") is None